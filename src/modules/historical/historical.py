@@ -39,7 +39,7 @@ class HistoricalModule(QObject):
     def disconnect_from_database(self):
         if self.connection:
             try:
-                self.connection.close()
+                server_module.release_module_connection(self.__class__.__name__, self.connection)
                 logger.info("HistoricalModule disconnected from database")
             except Exception as e:
                 logger.exception(f"Error disconnecting from database: {e}")
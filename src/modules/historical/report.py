@@ -1,26 +1,50 @@
 # report.py
 
+import pyodbc
 from typing import List, Dict, Any, Optional
 from datetime import date
 from modules.logger_config import get_logger
+from modules.product.server import DatabaseConnector
 
 logger = get_logger('Report')
 
 class ReportModule:
     def __init__(self, server_module):
         self.server_module = server_module
+        self.connection = None
 
     def initialize(self, server_info):
         if not self.server_module.connect_to_database(server_info):
             raise ConnectionError(f"Failed to connect to server: {server_info.name}")
+        # Reports only read, so they get their own read-intent connection instead of
+        # queueing behind the write path on the shared server connection.
+        self.close()
+        try:
+            self.connection = DatabaseConnector.connect(server_info, read_only=True)
+            self.connection.setdecoding(pyodbc.SQL_CHAR, encoding='utf-8')
+        except pyodbc.Error as e:
+            raise ConnectionError(f"Failed to open read-only connection to server: {server_info.name}") from e
+
+    def close(self):
+        if self.connection:
+            DatabaseConnector.disconnect(self.connection)
+            self.connection = None
 
     def log_activity(self, module: str, action: str, status: str):
         self.server_module.log_activity("ReportModule", action, status)
 
     def execute_query(self, query, params=None, fetch=True):
+        if not fetch or not self.connection:
+            return self.server_module.execute_query(query, params, fetch)
+
         try:
-            result = self.server_module.execute_query(query, params, fetch)
-            return result
+            with self.connection.cursor() as cursor:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
+                columns = [column[0] for column in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
         except Exception as e:
             logger.error(f"Database error: {str(e)}")
             raise
@@ -16,30 +16,36 @@ class ReportWidget(BaseTableWidget):
         super().__init__(main_window)
         self.server_module = server_module
         self.report_module = None
-        apply_styles(self, 'historical')
+        self._current_server_id = None
         self.init_ui()
+        # Style once the whole tree exists so it is polished in a single pass
+        apply_styles(self, 'historical')
 
     def init_ui(self):
-        main_layout = QVBoxLayout(self)
-        main_layout.setSpacing(20)
-        main_layout.setContentsMargins(20, 20, 20, 20)
+        self.setUpdatesEnabled(False)
+        try:
+            main_layout = QVBoxLayout(self)
+            main_layout.setSpacing(20)
+            main_layout.setContentsMargins(20, 20, 20, 20)
 
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_content = QWidget()
-        scroll_layout = QVBoxLayout(scroll_content)
+            scroll_area = QScrollArea()
+            scroll_area.setWidgetResizable(True)
+            scroll_content = QWidget()
+            scroll_layout = QVBoxLayout(scroll_content)
 
-        self.setup_server_selection(scroll_layout)
-        self.create_top_bar()
-        scroll_layout.addWidget(self.top_bar)
+            self.setup_server_selection(scroll_layout)
+            self.create_top_bar()
+            scroll_layout.addWidget(self.top_bar)
 
-        self.report_table = QTableWidget()
-        self.create_report_table()
-        self.add_table(self.report_table)
-        scroll_layout.addWidget(self.report_table)
+            self.report_table = QTableWidget()
+            self.create_report_table()
+            self.add_table(self.report_table)
+            scroll_layout.addWidget(self.report_table)
 
-        scroll_area.setWidget(scroll_content)
-        main_layout.addWidget(scroll_area)
+            scroll_area.setWidget(scroll_content)
+            main_layout.addWidget(scroll_area)
+        finally:
+            self.setUpdatesEnabled(True)
 
     def setup_server_selection(self, layout):
         server_frame = QFrame()
@@ -92,6 +98,9 @@ class ReportWidget(BaseTableWidget):
         self.report_table.verticalHeader().setVisible(False)
         self.report_table.setSelectionBehavior(QTableWidget.SelectRows)
         self.report_table.setSelectionMode(QTableWidget.SingleSelection)
+        # The table paints every pixel itself, so skip compositing the parent background
+        self.report_table.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        self.report_table.setAutoFillBackground(False)
     ...
 
     def populate_report_table(self, report_data):
@@ -150,15 +159,27 @@ class ReportWidget(BaseTableWidget):
     def on_server_changed(self, index):
         server_info = self.server_combo.itemData(index)
         if server_info:
+            server_id = getattr(server_info, 'id', None)
+            if server_id == self._current_server_id and self.report_module is not None:
+                return
             logger.info(f"Attempting to connect to server: {server_info.name}")
             try:
-                self.report_module = ReportModule(self.server_module)
-                self.report_module.initialize(server_info)
+                if self.report_module:
+                    self.report_module.close()
+                    self.report_module = None
+                self._current_server_id = None
+                report_module = ReportModule(self.server_module)
+                report_module.initialize(server_info)
+                self.report_module = report_module
+                self._current_server_id = server_id
+                # Reports are generated on demand so browsing the combo box doesn't query the DB
                 logger.info("Successfully connected to the database")
-                self.generate_report()
             except ConnectionError as e:
                 logger.error(f"Failed to connect to the server: {str(e)}")
                 QMessageBox.warning(self, "Connection Error", f"Failed to connect to the server: {str(e)}")
         else:
+            if self.report_module:
+                self.report_module.close()
             self.report_module = None
+            self._current_server_id = None
             self.report_table.setRowCount(0)
\ No newline at end of file
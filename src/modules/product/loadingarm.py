@@ -4,20 +4,35 @@ from PySide6.QtCore import QObject, Signal, Slot, QTimer
 from .server import server_module
 from .modbus import modbus_module
 from typing import List, Dict, Any, Optional, Union
+from collections import namedtuple
+from threading import Lock
 import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+HISTORICAL_ROW_LIMIT = 10000
+
+# Immutable per-arm view shared by every realtime_data_updated subscriber
+ArmSnapshot = namedtuple(
+    'ArmSnapshot',
+    'id name code flow_rate is_active loading_weight unit_name last_reading_datetime mapping_id'
+)
+
 class LoadingArmModule(QObject):
     data_updated = Signal()
     error_occurred = Signal(str)
-    realtime_data_updated = Signal(list)
+    realtime_data_updated = Signal(tuple)
 
     def __init__(self):
         super().__init__()
         self.loading_arms = []
+        self.snapshot = ()
+        # Replaced only when the set of arms is refetched, so consumers can compare by identity
+        self.arm_names = frozenset()
         self.connection = None
+        # Historical fetches run on a worker thread and share this connection
+        self.query_lock = Lock()
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.fetch_realtime_loading_arms)
         server_module.connection_status_changed.connect(self.on_connection_status_changed)
@@ -35,16 +50,28 @@ class LoadingArmModule(QObject):
         self.update_loading_arms_from_modbus(data)
 
     def update_loading_arms_from_modbus(self, modbus_data):
+        # Every reading in one Modbus packet shares the same timestamp
+        now = datetime.datetime.now()
         for arm in self.loading_arms:
             arm_id = arm['id']
             if (arm_id, 'FlowRate') in modbus_data:
                 arm['flow_rate'] = modbus_data[(arm_id, 'FlowRate')]
-                arm['last_reading_datetime'] = datetime.datetime.now()
+                arm['last_reading_datetime'] = now
                 arm['is_active'] = True
             else:
                 arm['is_active'] = False
 
-        self.realtime_data_updated.emit(self.loading_arms)
+        self.emit_realtime_snapshot()
+
+    def emit_realtime_snapshot(self):
+        self.snapshot = tuple(
+            ArmSnapshot(
+                arm['id'], arm['name'], arm['code'], arm['flow_rate'], arm['is_active'],
+                arm['loading_weight'], arm['unit_name'], arm['last_reading_datetime'], arm['mapping_id']
+            )
+            for arm in self.loading_arms
+        )
+        self.realtime_data_updated.emit(self.snapshot)
 
     def connect_to_database(self):
         try:
@@ -64,13 +91,20 @@ class LoadingArmModule(QObject):
         self.stop_refresh_timer()
         if self.connection:
             try:
-                self.connection.close()
+                # Wait out any historical fetch still using the connection before handing it back
+                with self.query_lock:
+                    try:
+                        server_module.release_module_connection(self.__class__.__name__, self.connection)
+                    finally:
+                        self.connection = None
                 logger.info("LoadingArmModule disconnected from database")
             except Exception as e:
                 logger.error(f"Error disconnecting from database: {e}")
             finally:
                 self.connection = None
                 self.loading_arms = []
+                self.snapshot = ()
+                self.arm_names = frozenset()
 
     def execute_query(self, query: str, params: tuple = (), fetch: bool = True) -> Optional[Union[List[Dict[str, Any]], int]]:
         if not self.connection:
@@ -78,7 +112,7 @@ class LoadingArmModule(QObject):
             return None
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.query_lock, self.connection.cursor() as cursor:
                 cursor.execute(query, params)
                 if fetch:
                     columns = [column[0] for column in cursor.description]
@@ -124,14 +158,16 @@ class LoadingArmModule(QObject):
                 }
                 for row in results
             ]
-            self.realtime_data_updated.emit(self.loading_arms)
+            self.arm_names = frozenset(arm['name'] for arm in self.loading_arms)
+            self.emit_realtime_snapshot()
             self.data_updated.emit()
         else:
             self.error_occurred.emit("Failed to fetch real-time loading arm data")
 
-    def get_historical_loading_arm_data(self, start_date, end_date):
+    def get_historical_loading_arm_data(self, start_date, end_date, limit: int = HISTORICAL_ROW_LIMIT):
+        # Newest first; TOP (?) caps how many rows a wide date range sends back
         query = """
-        SELECT 
+        SELECT TOP (?)
             la.LoadingArmCode, la.LoadingArmName,
             s.PartyName AS SellerName, b.PartyName AS BuyerName,
             p.ProductName, o.ActualQuantity AS LoadingWeight, u.UnitName,
@@ -145,7 +181,7 @@ class LoadingArmModule(QObject):
         WHERE o.LoadingDate BETWEEN ? AND ?
         ORDER BY o.LoadingDate DESC, o.LoadingTime DESC
         """
-        return self.execute_query(query, params=(start_date, end_date))
+        return self.execute_query(query, params=(limit, start_date, end_date))
 
     def get_loading_arm_details(self, loading_arm_id):
         query = """
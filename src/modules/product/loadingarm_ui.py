@@ -1,30 +1,213 @@
 # loadingarm_ui.py
 
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                               QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QComboBox, QDateEdit,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+                               QDialog, QFormLayout, QLineEdit, QComboBox, QDateEdit,
                                QMessageBox, QHeaderView, QAbstractItemView, QTabWidget, QLabel, QSplitter,
                                QSizePolicy)
-from PySide6.QtCore import Qt, QTimer, QDate, Slot, QDateTime
+from PySide6.QtCore import (Qt, QTimer, QDate, Slot, Signal, QObject, QDateTime, QAbstractTableModel, QModelIndex,
+                            QPointF, QRunnable, QThreadPool, QSignalBlocker)
 from PySide6.QtGui import QDoubleValidator, QPainter
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
 from .loadingarm import loading_arm_module
 from .modbus import modbus_module
 from .server import server_module
 from ui.ui_styles import apply_styles, Styles, TMSWidget
+from collections import deque
+from operator import itemgetter
+from contextlib import contextmanager
 import logging
 import datetime
 
 logger = logging.getLogger(__name__)
 
+CHART_MAX_POINTS = 50
+
+ALIGN_TEXT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+ALIGN_NUMBER = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+CHART_TIME_RESOLUTION_MS = 1000  # The time axis labels are hh:mm:ss
+
+def loading_timestamp_ms(loading_date, loading_time):
+    """Milliseconds since the epoch for an order's LoadingDate/LoadingTime pair."""
+    if isinstance(loading_date, datetime.date) and isinstance(loading_time, datetime.time):
+        moment = datetime.datetime.combine(loading_date, loading_time)
+    else:
+        moment = datetime.datetime.fromisoformat(f"{loading_date} {loading_time}")
+    return moment.timestamp() * 1000
+
+@contextmanager
+def suspended_updates(view):
+    """Hold repaints, sorting and selection signals on a view while its model is repopulated."""
+    sorting_enabled = view.isSortingEnabled()
+    view.setUpdatesEnabled(False)
+    view.setSortingEnabled(False)
+    # The model's own signals must still reach the view; only selection churn is silenced
+    selection_blocker = QSignalBlocker(view.selectionModel())
+    try:
+        yield view
+    finally:
+        selection_blocker.unblock()
+        view.setSortingEnabled(sorting_enabled)
+        view.setUpdatesEnabled(True)
+
+class RealtimeArmModel(QAbstractTableModel):
+    HEADERS = ["Loading Arm Name", "Code", "Flow Rate", "Active", "Loading Weight", "Unit", "Last Reading"]
+    ALIGNMENTS = (ALIGN_TEXT, ALIGN_TEXT, ALIGN_NUMBER, ALIGN_TEXT, ALIGN_NUMBER, ALIGN_TEXT, ALIGN_TEXT)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = ()
+        self._formatted = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        # Only text and alignment are provided; every other role falls back to the view's defaults
+        if role != Qt.ItemDataRole.DisplayRole:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return self.ALIGNMENTS[index.column()]
+            return None
+        if not index.isValid():
+            return None
+        return self._formatted[index.row()][index.column()]
+
+    @staticmethod
+    def format_row(arm):
+        return (
+            arm.name,
+            arm.code,
+            f"{arm.flow_rate:.2f}",
+            "Yes" if arm.is_active else "No",
+            f"{arm.loading_weight:.2f}",
+            arm.unit_name,
+            str(arm.last_reading_datetime),
+        )
+
+    def arm_at(self, row):
+        return self._rows[row]
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self._rows = rows
+        self._formatted = [self.format_row(arm) for arm in rows]
+        self.endResetModel()
+
+    def update_rows(self, rows):
+        old_rows = self._rows
+        if len(old_rows) != len(rows) or any(old.id != new.id for old, new in zip(old_rows, rows)):
+            # Arms were added, removed or reordered
+            self.set_rows(rows)
+            return
+
+        self._rows = rows
+        last_column = len(self.HEADERS) - 1
+        for row, (old, new) in enumerate(zip(old_rows, rows)):
+            if old != new:
+                self._formatted[row] = self.format_row(new)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
+class HistoricalArmModel(QAbstractTableModel):
+    HEADERS = [
+        "Loading Arm Code", "Loading Arm Name", "Seller Name", "Buyer Name",
+        "Product Name", "Loading Weight", "Unit", "Order Date", "Order Time"
+    ]
+    KEYS = [
+        'LoadingArmCode', 'LoadingArmName', 'SellerName', 'BuyerName',
+        'ProductName', 'LoadingWeight', 'UnitName', 'LoadingDate', 'LoadingTime'
+    ]
+    ALIGNMENTS = (ALIGN_TEXT,) * 5 + (ALIGN_NUMBER,) + (ALIGN_TEXT,) * 3
+    row_fields = itemgetter(*KEYS)
+    PAGE_SIZE = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._source = []
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return self.ALIGNMENTS[index.column()]
+            return None
+        if not index.isValid():
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def set_rows(self, rows):
+        # Rows are formatted a page at a time as the view scrolls to them (see fetchMore)
+        self.beginResetModel()
+        self._source = rows
+        self._rows = []
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < len(self._source)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        start = len(self._rows)
+        page = self._source[start:start + self.PAGE_SIZE]
+        if not page:
+            return
+        # Each page is formatted once, so repaints and scrolling are plain tuple lookups
+        row_fields = self.row_fields
+        self.beginInsertRows(QModelIndex(), start, start + len(page) - 1)
+        self._rows.extend(tuple(map(str, row_fields(row))) for row in page)
+        self.endInsertRows()
+
+class HistoricalFetcherSignals(QObject):
+    finished = Signal(object)
+
+class HistoricalFetcher(QRunnable):
+    """Runs the historical loading arm query on the global thread pool."""
+
+    def __init__(self, start_date, end_date):
+        super().__init__()
+        self.start_date = start_date
+        self.end_date = end_date
+        self.signals = HistoricalFetcherSignals()
+
+    def run(self):
+        historical_data = loading_arm_module.get_historical_loading_arm_data(self.start_date, self.end_date)
+        self.signals.finished.emit(historical_data)
+
 class LoadingArmWidget(TMSWidget):
     def __init__(self):
         super().__init__()
         self.is_connected = False
         self.is_modbus_connected = False
+        self._historical_fetcher = None
         apply_styles(self)
         self.init_ui()
 
-        loading_arm_module.realtime_data_updated.connect(self.update_realtime_data)
+        # Bursts of realtime updates are collapsed into one refresh per interval
+        self._pending_data = None
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(150)
+        self._coalesce_timer.timeout.connect(self._flush_realtime)
+
+        loading_arm_module.realtime_data_updated.connect(self._queue_realtime)
         loading_arm_module.error_occurred.connect(self.show_error_message)
         server_module.connection_status_changed.connect(self.set_connection_status)
         modbus_module.modbus_connected.connect(self.set_modbus_connection_status)
@@ -50,7 +233,9 @@ class LoadingArmWidget(TMSWidget):
         self.tab_widget.addTab(self.historical_widget, "Historical Data")
 
         # Real-time table
-        self.realtime_table = QTableWidget()
+        self.realtime_model = RealtimeArmModel(self)
+        self.realtime_table = QTableView()
+        self.realtime_table.setModel(self.realtime_model)
         self.realtime_layout.addWidget(self.realtime_table)
 
         # Real-time chart
@@ -72,7 +257,9 @@ class LoadingArmWidget(TMSWidget):
         self.historical_layout.addWidget(historical_splitter)
 
         # Historical table
-        self.historical_table = QTableWidget()
+        self.historical_model = HistoricalArmModel(self)
+        self.historical_table = QTableView()
+        self.historical_table.setModel(self.historical_model)
         historical_splitter.addWidget(self.historical_table)
 
         # Chart view
@@ -105,77 +292,70 @@ class LoadingArmWidget(TMSWidget):
         self.update_ui_elements()
 
     def setup_realtime_table(self):
-        self.realtime_table.setColumnCount(7)
-        self.realtime_table.setHorizontalHeaderLabels([
-            "Loading Arm Name", "Code", "Flow Rate", "Active", "Loading Weight", "Unit", "Last Reading"
-        ])
         self.realtime_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.realtime_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.realtime_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.realtime_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
     def setup_historical_table(self):
-        self.historical_table.setColumnCount(9)
-        self.historical_table.setHorizontalHeaderLabels([
-            "Loading Arm Code", "Loading Arm Name", "Seller Name", "Buyer Name",
-            "Product Name", "Loading Weight", "Unit", "Order Date", "Order Time"
-        ])
         self.historical_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.historical_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.historical_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.historical_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
 
-    @Slot(list)
+    @Slot(tuple)
+    def _queue_realtime(self, data):
+        self._pending_data = data
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def _flush_realtime(self):
+        data, self._pending_data = self._pending_data, None
+        if data is not None:
+            self.update_realtime_data(data)
+
     def update_realtime_data(self, data):
-        self.realtime_table.setRowCount(len(data))
-        for row, arm in enumerate(data):
-            self.realtime_table.setItem(row, 0, QTableWidgetItem(arm['name']))
-            self.realtime_table.setItem(row, 1, QTableWidgetItem(arm['code']))
-            self.realtime_table.setItem(row, 2, QTableWidgetItem(f"{arm['flow_rate']:.2f}"))
-            self.realtime_table.setItem(row, 3, QTableWidgetItem("Yes" if arm['is_active'] else "No"))
-            self.realtime_table.setItem(row, 4, QTableWidgetItem(f"{arm['loading_weight']:.2f}"))
-            self.realtime_table.setItem(row, 5, QTableWidgetItem(arm['unit_name']))
-            self.realtime_table.setItem(row, 6, QTableWidgetItem(str(arm['last_reading_datetime'])))
+        with suspended_updates(self.realtime_table):
+            self.realtime_model.update_rows(data)
 
         self.realtime_chart_widget.update_chart(data)
 
     def fetch_historical_data(self):
         start_date = self.start_date.date().toPython()
         end_date = self.end_date.date().toPython()
-        historical_data = loading_arm_module.get_historical_loading_arm_data(start_date, end_date)
 
-        if isinstance(historical_data, list):
-            self.historical_table.setRowCount(len(historical_data))
-            for row, data in enumerate(historical_data):
-                self.historical_table.setItem(row, 0, QTableWidgetItem(str(data['LoadingArmCode'])))
-                self.historical_table.setItem(row, 1, QTableWidgetItem(str(data['LoadingArmName'])))
-                self.historical_table.setItem(row, 2, QTableWidgetItem(str(data['SellerName'])))
-                self.historical_table.setItem(row, 3, QTableWidgetItem(str(data['BuyerName'])))
-                self.historical_table.setItem(row, 4, QTableWidgetItem(str(data['ProductName'])))
-                self.historical_table.setItem(row, 5, QTableWidgetItem(str(data['LoadingWeight'])))
-                self.historical_table.setItem(row, 6, QTableWidgetItem(str(data['UnitName'])))
-                self.historical_table.setItem(row, 7, QTableWidgetItem(str(data['LoadingDate'])))
-                self.historical_table.setItem(row, 8, QTableWidgetItem(str(data['LoadingTime'])))
+        self.fetch_historical_button.setEnabled(False)
+        self._historical_fetcher = HistoricalFetcher(start_date, end_date)
+        self._historical_fetcher.signals.finished.connect(self._on_historical_loaded)
+        QThreadPool.globalInstance().start(self._historical_fetcher)
 
+    @Slot(object)
+    def _on_historical_loaded(self, historical_data):
+        self._historical_fetcher = None
+        self.fetch_historical_button.setEnabled(self.is_connected)
+
+        if isinstance(historical_data, list):
+            with suspended_updates(self.historical_table):
+                self.historical_model.set_rows(historical_data)
             self.plot_historical_data(historical_data)
         else:
-            self.historical_table.setRowCount(0)
+            self.historical_model.set_rows([])
             QMessageBox.warning(self, "No Data", "No historical data found for the selected date range.")
 
     def plot_historical_data(self, data):
         chart = QChart()
         chart.setTitle("Historical Loading Data")
+        chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
 
         series = QLineSeries()
         series.setName("Loading Weight")
 
-        for row in data:
-            # Convert the date and time strings to QDateTime
-            date_str = str(row['LoadingDate'])
-            time_str = str(row['LoadingTime'])
-            dt = QDateTime.fromString(f"{date_str} {time_str}", "yyyy-MM-dd HH:mm:ss")
-            timestamp = dt.toMSecsSinceEpoch()
-            series.append(timestamp, float(row['LoadingWeight']))
+        # Fill the series in one call before it joins the chart, so the chart lays out once
+        points = [
+            QPointF(loading_timestamp_ms(row['LoadingDate'], row['LoadingTime']), float(row['LoadingWeight']))
+            for row in data
+        ]
+        series.replace(points)
 
         chart.addSeries(series)
 
@@ -196,8 +376,10 @@ class LoadingArmWidget(TMSWidget):
         if is_connected:
             loading_arm_module.fetch_realtime_loading_arms()
         else:
-            self.realtime_table.setRowCount(0)
-            self.historical_table.setRowCount(0)
+            self._coalesce_timer.stop()
+            self._pending_data = None
+            self.realtime_model.set_rows(())
+            self.historical_model.set_rows([])
 
     def set_modbus_connection_status(self, is_connected):
         self.is_modbus_connected = is_connected
@@ -213,7 +395,7 @@ class LoadingArmWidget(TMSWidget):
         self.historical_table.setEnabled(self.is_connected)
         self.start_date.setEnabled(self.is_connected)
         self.end_date.setEnabled(self.is_connected)
-        self.fetch_historical_button.setEnabled(self.is_connected)
+        self.fetch_historical_button.setEnabled(self.is_connected and self._historical_fetcher is None)
         self.add_button.setEnabled(self.is_connected)
         self.edit_button.setEnabled(self.is_connected)
         self.delete_button.setEnabled(self.is_connected)
@@ -232,9 +414,10 @@ class LoadingArmWidget(TMSWidget):
                 QMessageBox.warning(self, "Error", "Failed to add loading arm.")
 
     def edit_loading_arm(self):
-        selected_row = self.realtime_table.currentRow()
+        selected_row = self.realtime_table.currentIndex().row()
         if selected_row >= 0:
-            loading_arm_id = loading_arm_module.loading_arms[selected_row]['id']
+            # The model holds the rows on screen; the module snapshot may already be newer
+            loading_arm_id = self.realtime_model.arm_at(selected_row).id
             dialog = LoadingArmDialog(self, loading_arm_id)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 data = dialog.get_data()
@@ -246,14 +429,14 @@ class LoadingArmWidget(TMSWidget):
             QMessageBox.warning(self, "No Selection", "Please select a loading arm to edit.")
 
     def delete_loading_arm(self):
-        selected_row = self.realtime_table.currentRow()
+        selected_row = self.realtime_table.currentIndex().row()
         if selected_row >= 0:
-            loading_arm = loading_arm_module.loading_arms[selected_row]
+            loading_arm = self.realtime_model.arm_at(selected_row)
             confirm = QMessageBox.question(self, "Confirm Deletion",
-                                           f"Are you sure you want to delete {loading_arm['name']}?",
+                                           f"Are you sure you want to delete {loading_arm.name}?",
                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if confirm == QMessageBox.StandardButton.Yes:
-                if loading_arm_module.delete_loading_arm(loading_arm['id']):
+                if loading_arm_module.delete_loading_arm(loading_arm.id):
                     QMessageBox.information(self, "Success", "Loading arm deleted successfully.")
                 else:
                     QMessageBox.warning(self, "Error", "Failed to delete loading arm.")
@@ -347,6 +530,8 @@ class RealTimeChartWidget(QWidget):
 
         self.chart = QChart()
         self.chart.setTitle("Real-Time Flow Rates")
+        # A live monitor redraws every second; animating each update only costs frames
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
         self.chart_view.setChart(self.chart)
 
         self.time_axis = QDateTimeAxis()
@@ -359,6 +544,10 @@ class RealTimeChartWidget(QWidget):
         self.chart.addAxis(self.value_axis, Qt.AlignmentFlag.AlignLeft)
 
         self.series_dict = {}
+        self._points = {}
+        self._last_ymax = None
+        self._last_time_end = None
+        self._arm_names = None
 
     def start_chart_updates(self):
         self.update_timer.start(1000)  # Update every second
@@ -368,41 +557,62 @@ class RealTimeChartWidget(QWidget):
 
     def update_chart(self, data=None):
         if data is None:
-            data = loading_arm_module.loading_arms
-
-        current_time = QDateTime.currentDateTime()
-
+            data = loading_arm_module.snapshot
+
+        # One clock read per tick, shared by every arm
+        timestamp = QDateTime.currentMSecsSinceEpoch()
+
+        # Remove series for loading arms that no longer exist, only after the arm list was refetched
+        arm_names = loading_arm_module.arm_names
+        if arm_names is not self._arm_names:
+            for name in list(self.series_dict.keys()):
+                if name not in arm_names:
+                    self.chart.removeSeries(self.series_dict.pop(name))
+                    del self._points[name]
+            self._arm_names = arm_names
+
+        # Single pass: create missing series, append points and track the max flow rate
+        max_rate = 0
         for arm in data:
-            if arm['name'] not in self.series_dict:
-                new_series = QLineSeries()
-                new_series.setName(arm['name'])
-                self.chart.addSeries(new_series)
-                new_series.attachAxis(self.time_axis)
-                new_series.attachAxis(self.value_axis)
-                self.series_dict[arm['name']] = new_series
-
-            series = self.series_dict[arm['name']]
-            series.append(current_time.toMSecsSinceEpoch(), arm['flow_rate'])
-
-            # Keep only the last 50 points to avoid cluttering
-            if series.count() > 50:
-                series.remove(0)
-
-        self.time_axis.setRange(current_time.addSecs(-300), current_time)  # Show last 5 minutes
-
-        if data:
-            self.value_axis.setRange(0, max(arm['flow_rate'] for arm in data) * 1.1)  # Set y-axis range with 10% margin
-        else:
-            self.value_axis.setRange(0, 1)  # Default range when no data is available
-
-        # Remove series for loading arms that no longer exist
-        arm_names = set(arm['name'] for arm in data)
-        for name in list(self.series_dict.keys()):
-            if name not in arm_names:
-                self.chart.removeSeries(self.series_dict[name])
-                del self.series_dict[name]
+            flow_rate = arm.flow_rate
+            self.update_point(arm.name, timestamp, flow_rate)
+            if flow_rate > max_rate:
+                max_rate = flow_rate
+
+        # Show last 5 minutes; moving the window by less than one label step changes nothing visible
+        if self._last_time_end is None or timestamp - self._last_time_end >= CHART_TIME_RESOLUTION_MS:
+            current_time = QDateTime.fromMSecsSinceEpoch(timestamp)
+            self.time_axis.setRange(current_time.addSecs(-300), current_time)
+            self._last_time_end = timestamp
+
+        # Set y-axis range with 10% margin, or a default range when no data is available
+        ymax = max_rate * 1.1 or 1
+        # Every setRange recomputes the axis ticks, so ignore changes under 1%
+        if self._last_ymax is None or abs(ymax - self._last_ymax) > self._last_ymax * 0.01:
+            self.value_axis.setRange(0, ymax)
+            self._last_ymax = ymax
+
+    def update_point(self, name, timestamp, flow_rate):
+        series = self.series_dict.get(name)
+        if series is None:
+            series = QLineSeries()
+            series.setName(name)
+            self.chart.addSeries(series)
+            series.attachAxis(self.time_axis)
+            series.attachAxis(self.value_axis)
+            self.series_dict[name] = series
+            self._points[name] = deque(maxlen=CHART_MAX_POINTS)
+
+        # The deque drops the oldest point itself; replace() swaps the whole buffer in one call
+        points = self._points[name]
+        points.append(QPointF(timestamp, flow_rate))
+        series.replace(list(points))
 
     def clear_chart(self):
         for series in self.series_dict.values():
             self.chart.removeSeries(series)
-        self.series_dict.clear()
\ No newline at end of file
+        self.series_dict.clear()
+        self._points.clear()
+        self._last_ymax = None
+        self._last_time_end = None
+        self._arm_names = None
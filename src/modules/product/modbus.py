@@ -2,10 +2,15 @@
 
 from PySide6.QtCore import QObject, Signal, Slot, QThread
 from .server import server_module
-from collections import OrderedDict
-from threading import Lock
+from collections import namedtuple
+from functools import lru_cache
+from itertools import groupby
+from operator import attrgetter
+from types import SimpleNamespace
+from threading import Event, Lock
 import logging
 import time
+import pyodbc
 from pymodbus.client import ModbusSerialClient
 from pymodbus.exceptions import ModbusException
 from typing import List, Dict, Any, Optional
@@ -14,25 +19,115 @@ logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
+# Registers closer together than this are read in one request, gap registers included
+READ_GAP_THRESHOLD = 4
+# Protocol limits on the quantity of a single read request, per function code
+MAX_READ_COUNT = {1: 2000, 2: 2000, 3: 125, 4: 125}
+
+@lru_cache(maxsize=None)
+def procedure_call_sql(procedure_name: str, param_count: int) -> str:
+    # ODBC call escape lets the driver bind the procedure call as an RPC instead of a text batch
+    placeholders = ', '.join('?' * param_count)
+    return f"{{CALL inventory.{procedure_name} ({placeholders})}}"
+
+# Written for every mapped register once per cycle; pyodbc keeps it prepared while the cursor lives
+UPDATE_VALUE_SQL = procedure_call_sql('UpdateMappedModbusValue', 2)
+
+SLAVE_QUERY = """
+SELECT SlaveAddress, SlaveName, Baudrate, Port, IsActive, Databits, Parity, StopBits
+FROM inventory.ActiveModbus
+"""
+
+REGISTER_MAPPING_QUERY = """
+SELECT rm.MappingId, rm.SlaveAddress, rm.RegisterAddress, rm.RegisterType, rm.FunctionCode,
+       rm.MappedTable, rm.MappedColumn, rm.MappedEntityId, rm.ScaleFactor, rm.Offset,
+       rm.StoreHistorical, rm.IsReadOnly, m.SlaveName, 
+       CASE 
+           WHEN rm.MappedTable = 'StorageTank' THEN st.StorageTankName
+           WHEN rm.MappedTable = 'LoadingArm' THEN la.LoadingArmName
+           WHEN rm.MappedTable = 'Weighbridge' THEN wb.WeighbridgeName
+       END AS EntityName
+FROM inventory.ActiveRegisterMapping rm
+JOIN inventory.ActiveModbus m ON rm.SlaveAddress = m.SlaveAddress
+LEFT JOIN inventory.ActiveStorageTank st ON rm.MappedTable = 'StorageTank' AND rm.MappedEntityId = st.StorageTankId
+LEFT JOIN inventory.ActiveLoadingArm la ON rm.MappedTable = 'LoadingArm' AND rm.MappedEntityId = la.LoadingArmId
+LEFT JOIN inventory.ActiveWeighbridge wb ON rm.MappedTable = 'Weighbridge' AND rm.MappedEntityId = wb.WeighbridgeId
+"""
+
+# Delay before reopening the value-write connection after it fails, doubling up to the maximum
+WRITE_RETRY_MIN = 0.5
+WRITE_RETRY_MAX = 30.0
+
+# Bits on the wire per RTU character: start, 8 data, parity or second stop, stop
+CHARACTER_BITS = 11
+# Largest read response: address, function, byte count, 125 registers, CRC
+MAX_RESPONSE_BYTES = 5 + 2 * 125
+# Allowance for the slave to process a request before it starts answering
+SLAVE_TURNAROUND = 0.02
+
+def response_timeout(baudrate: int) -> float:
+    # Wire time of the largest response we can ask for; anything slower is a missing reply
+    return MAX_RESPONSE_BYTES * CHARACTER_BITS / baudrate + SLAVE_TURNAROUND
+
+# Seconds between reads of a mapped entity; tank levels move slowly, weighbridges do not
+POLL_INTERVALS = {'Weighbridge': 0.1, 'LoadingArm': 0.5, 'StorageTank': 2.0}
+DEFAULT_POLL_INTERVAL = 0.1
+
+def poll_interval(mapping: pyodbc.Row) -> float:
+    return POLL_INTERVALS.get(mapping.MappedTable, DEFAULT_POLL_INTERVAL)
+
+# One Modbus request covering registers start..start+count-1, repeated every interval seconds;
+# fields holds read_field tuples
+ReadBlock = namedtuple('ReadBlock', 'function_code start count fields interval')
+
+def read_field(mapping: pyodbc.Row, offset: int) -> tuple:
+    # Flattened for the read loop: (offset, mapping id, scale, bias, weighbridge id or None)
+    weighbridge_id = None
+    if mapping.MappedTable == 'Weighbridge' and mapping.MappedColumn == 'CurrentWeight':
+        weighbridge_id = mapping.MappedEntityId
+    return (offset, mapping.MappingId, mapping.ScaleFactor, mapping.Offset, weighbridge_id)
+
+def build_read_plan(mappings: List[pyodbc.Row]) -> List[ReadBlock]:
+    plan = []
+    ordered = sorted(mappings, key=lambda m: (poll_interval(m), m.FunctionCode, m.RegisterAddress))
+    interval = function_code = start = end = None
+    fields = []
+    for mapping in ordered:
+        address = mapping.RegisterAddress
+        if (poll_interval(mapping) == interval
+                and mapping.FunctionCode == function_code
+                and address - end <= READ_GAP_THRESHOLD
+                and address - start < MAX_READ_COUNT.get(function_code, 1)):
+            end = max(end, address)
+        else:
+            if fields:
+                plan.append(ReadBlock(function_code, start, end - start + 1, fields, interval))
+            interval, function_code = poll_interval(mapping), mapping.FunctionCode
+            start, end, fields = address, address, []
+        fields.append(read_field(mapping, address - start))
+    if fields:
+        plan.append(ReadBlock(function_code, start, end - start + 1, fields, interval))
+    return plan
+
 class ModbusReaderThread(QThread):
     data_read = Signal(dict)
 
     def __init__(self, modbus_module):
         super().__init__()
         self.modbus_module = modbus_module
-        self.running = True
+        self.stop_event = Event()
 
     def run(self):
-        while self.running:
+        while not self.stop_event.is_set():
             try:
                 data = self.modbus_module.read_all_slaves()
                 self.data_read.emit(data)
             except Exception as e:
                 logger.error(f"Error in ModbusReaderThread: {str(e)}")
-            time.sleep(0.1)  # Adjust this value to control read frequency
+            self.stop_event.wait(0.1)  # Adjust this value to control read frequency; returns at once on stop
 
     def stop(self):
-        self.running = False
+        self.stop_event.set()
 
 class ModbusModule(QObject):
     data_updated = Signal(dict)
@@ -45,14 +140,28 @@ class ModbusModule(QObject):
         super().__init__()
         self.slaves = []
         self.register_mappings = {}
-        self.last_values = OrderedDict()
-        self.last_values_lock = Lock()
+        self.read_plans = {}
+        self.read_deadlines = {}
+        self.last_values = {}
         self.modbus_client = None
+        self.fc_readers = {}
         self.is_modbus_connected = False
         self.connection = None
+        # Value writes run on the reader thread, so they get their own connection
+        self.write_connection = None
+        self.update_cursor = None
+        self.write_lock = Lock()
+        # Slave and mapping fetches run on the thread pool and share the GUI's connection
+        self.query_lock = Lock()
+        self.write_backoff = 0.0
+        self.write_retry_at = 0.0
+        self.query_columns = {}
+        self.table_columns = {}
         server_module.connection_status_changed.connect(self.on_connection_status_changed)
         self.port = None
         self.reader_thread = None
+        self.silent_interval = 0.0
+        self.last_transaction = 0.0
 
 
 
@@ -64,10 +173,14 @@ class ModbusModule(QObject):
             self.disconnect_from_database()
 
     def connect_to_database(self):
+        # A writer left over from the previous server would keep sending values there
+        with self.write_lock:
+            self.close_write_connection()
         try:
             self.connection = server_module.get_module_connection(self.__class__.__name__)
             if self.connection:
                 logger.info(f"{self.__class__.__name__} connected to database")
+                self.write_backoff = self.write_retry_at = 0.0
                 self.database_connected.emit(True)
                 self.fetch_slaves()
                 self.fetch_register_mappings()
@@ -81,32 +194,54 @@ class ModbusModule(QObject):
     def disconnect_from_database(self):
         if self.connection:
             try:
-                self.connection.close()
+                with self.write_lock:
+                    self.close_write_connection()
+                # Wait out any pooled task still using the connection before handing it back
+                with self.query_lock:
+                    try:
+                        server_module.release_module_connection(self.__class__.__name__, self.connection)
+                    finally:
+                        self.connection = None
                 logger.info("ModbusModule disconnected from database")
             except Exception as e:
                 logger.exception(f"Error disconnecting from database: {e}")
             finally:
                 self.connection = None
+                self.query_columns = {}
+                self.table_columns = {}
                 self.slaves = []
                 self.register_mappings = {}
+                self.read_plans = {}
                 self.database_connected.emit(False)
 
     @property
     def is_connected(self):
         return self.connection is not None and self.is_modbus_connected
     
-    def execute_query(self, query: str, params: tuple = (), fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
+    def execute_query(self, query: str, params: tuple = (), fetch: bool = True, commit: bool = False,
+                      fetch_raw: bool = False) -> Optional[List[Any]]:
         if not self.connection:
             logger.error("No active database connection")
             self.error_occurred.emit("No active database connection")
             return None
 
         try:
-            with self.connection.cursor() as cursor:
+            with self.query_lock, self.connection.cursor() as cursor:
                 cursor.execute(query, params)
+                if fetch_raw:
+                    # pyodbc.Row already offers attribute access; skip building a dict per row
+                    rows = cursor.fetchall()
+                    if commit:
+                        self.connection.commit()
+                    return rows
                 if fetch:
-                    columns = [column[0] for column in cursor.description]
-                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    columns = self.query_columns.get(query)
+                    if columns is None:
+                        columns = self.query_columns[query] = tuple(column[0] for column in cursor.description)
+                    rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                    if commit:
+                        self.connection.commit()
+                    return rows
                 else:
                     self.connection.commit()
                     return [{"affected_rows": cursor.rowcount}]
@@ -119,8 +254,8 @@ class ModbusModule(QObject):
             return None
 
     def fetch_slaves(self):
-        query = "SELECT * FROM inventory.ActiveModbus ORDER BY SlaveAddress"
-        results = self.execute_query(query)
+        query = SLAVE_QUERY + "ORDER BY SlaveAddress"
+        results = self.execute_query(query, fetch_raw=True)
         if results is not None:
             self.slaves = results
             logger.info(f"Fetched {len(self.slaves)} slave devices")
@@ -130,36 +265,72 @@ class ModbusModule(QObject):
             self.error_occurred.emit("Failed to fetch slaves")
 
     def fetch_register_mappings(self):
-        query = """
-        SELECT rm.*, m.SlaveName, 
-               CASE 
-                   WHEN rm.MappedTable = 'StorageTank' THEN st.StorageTankName
-                   WHEN rm.MappedTable = 'LoadingArm' THEN la.LoadingArmName
-                   WHEN rm.MappedTable = 'Weighbridge' THEN wb.WeighbridgeName
-               END AS EntityName
-        FROM inventory.ActiveRegisterMapping rm
-        JOIN inventory.ActiveModbus m ON rm.SlaveAddress = m.SlaveAddress
-        LEFT JOIN inventory.ActiveStorageTank st ON rm.MappedTable = 'StorageTank' AND rm.MappedEntityId = st.StorageTankId
-        LEFT JOIN inventory.ActiveLoadingArm la ON rm.MappedTable = 'LoadingArm' AND rm.MappedEntityId = la.LoadingArmId
-        LEFT JOIN inventory.ActiveWeighbridge wb ON rm.MappedTable = 'Weighbridge' AND rm.MappedEntityId = wb.WeighbridgeId
-        ORDER BY rm.SlaveAddress, rm.RegisterAddress
-        """
-        results = self.execute_query(query)
+        query = REGISTER_MAPPING_QUERY + "ORDER BY rm.SlaveAddress, rm.RegisterAddress"
+        results = self.execute_query(query, fetch_raw=True)
         if results is not None:
-            self.register_mappings = {}
-            for mapping in results:
-                slave_address = mapping['SlaveAddress']
-                if slave_address not in self.register_mappings:
-                    self.register_mappings[slave_address] = []
-                self.register_mappings[slave_address].append(mapping)
+            # Rows arrive ordered by SlaveAddress, so each slave is one run
+            self.register_mappings = {
+                slave_address: list(mappings)
+                for slave_address, mappings in groupby(results, key=attrgetter('SlaveAddress'))
+            }
+            self.read_plans = {
+                slave_address: build_read_plan(mappings)
+                for slave_address, mappings in self.register_mappings.items()
+            }
+            self.read_deadlines = {}
             logger.info(f"Fetched register mappings for {len(self.register_mappings)} slave devices")
             self.data_updated.emit(self.last_values)
         else:
             logger.error("Failed to fetch register mappings")
             self.error_occurred.emit("Failed to fetch register mappings")
 
-    def set_connection_params(self, port: str, baudrate: int, parity: str = 'N', stopbits: int = 1, bytesize: int = 8, timeout: float = 1):
+    def refresh_slave(self, slave_address: int):
+        # Re-read one slave after an edit instead of refetching the whole table
+        rows = self.execute_query(SLAVE_QUERY + "WHERE SlaveAddress = ?", params=(slave_address,), fetch_raw=True)
+        slaves = [slave for slave in self.slaves if slave.SlaveAddress != slave_address]
+        if rows:
+            slaves.append(rows[0])
+            slaves.sort(key=attrgetter('SlaveAddress'))
+        else:
+            # Mappings are only listed for active slaves
+            self.register_mappings.pop(slave_address, None)
+            self.rebuild_read_plan(slave_address)
+        self.slaves = slaves
+        self.data_updated.emit(self.last_values)
+
+    def refresh_register_mapping(self, mapping_id: int):
+        # Re-read one mapping after an edit; it may have moved to another slave or disappeared
+        rows = self.execute_query(REGISTER_MAPPING_QUERY + "WHERE rm.MappingId = ?", params=(mapping_id,), fetch_raw=True)
+        for slave_address, mappings in list(self.register_mappings.items()):
+            if any(mapping.MappingId == mapping_id for mapping in mappings):
+                self.register_mappings[slave_address] = [mapping for mapping in mappings if mapping.MappingId != mapping_id]
+                self.rebuild_read_plan(slave_address)
+        if rows:
+            slave_address = rows[0].SlaveAddress
+            mappings = self.register_mappings.get(slave_address, []) + [rows[0]]
+            mappings.sort(key=attrgetter('RegisterAddress'))
+            self.register_mappings[slave_address] = mappings
+            self.rebuild_read_plan(slave_address)
+        self.data_updated.emit(self.last_values)
+
+    def rebuild_read_plan(self, slave_address: int):
+        mappings = self.register_mappings.get(slave_address)
+        if mappings:
+            self.read_plans[slave_address] = build_read_plan(mappings)
+        else:
+            self.register_mappings.pop(slave_address, None)
+            self.read_plans.pop(slave_address, None)
+        # Block indices changed, so the slave's blocks are all due again. The reader thread
+        # writes deadlines concurrently, so snapshot the items and rebind instead of deleting in place
+        self.read_deadlines = {
+            key: deadline for key, deadline in list(self.read_deadlines.items()) if key[0] != slave_address
+        }
+
+    def set_connection_params(self, port: str, baudrate: int, parity: str = 'N', stopbits: int = 1, bytesize: int = 8, timeout: Optional[float] = None):
         self.port = port
+        self.silent_interval = 3.5 * CHARACTER_BITS / baudrate
+        if timeout is None:
+            timeout = response_timeout(baudrate)
         self.modbus_client = ModbusSerialClient(
             port=port,
             baudrate=baudrate,
@@ -168,6 +339,13 @@ class ModbusModule(QObject):
             bytesize=bytesize,
             timeout=timeout
         )
+        # Function code -> (bound read method, response attribute holding the values)
+        self.fc_readers = {
+            1: (self.modbus_client.read_coils, 'bits'),
+            2: (self.modbus_client.read_discrete_inputs, 'bits'),
+            3: (self.modbus_client.read_holding_registers, 'registers'),
+            4: (self.modbus_client.read_input_registers, 'registers'),
+        }
         logger.info(f"Set Modbus connection parameters: port={port}, baudrate={baudrate}, parity={parity}, stopbits={stopbits}, bytesize={bytesize}, timeout={timeout}")
 
     def connect_modbus(self):
@@ -194,97 +372,152 @@ class ModbusModule(QObject):
             logger.info("Disconnected from Modbus serial port")
 
     def read_register(self, slave_address: int, mapping: Dict[str, Any]) -> Optional[float]:
+        # Callers outside this module pass the dict form of a mapping
+        block = ReadBlock(mapping['FunctionCode'], mapping['RegisterAddress'], 1, [read_field(SimpleNamespace(**mapping), 0)], 0)
+        updates = []
+        value = self.read_block(slave_address, block, updates).get(mapping['MappingId'])
+        self.update_database_values(updates)
+        return value
+
+    def read_block(self, slave_address: int, block: ReadBlock, updates: List[tuple]) -> Dict[int, float]:
+        if self.modbus_client is None:
+            raise ValueError("Modbus client not initialized. Call set_connection_params first.")
+
+        reader = self.fc_readers.get(block.function_code)
+        if reader is None:
+            logger.error(f"Unsupported function code: {block.function_code}")
+            return {}
+        read, values_attr = reader
+
         try:
-            function_code = mapping['FunctionCode']
-            address = mapping['RegisterAddress']
-            count = 1  # Assuming we're reading one register at a time
-
-            logger.info(f"Reading register {address} from slave {slave_address} using function code {function_code}")
-
-            if self.modbus_client is None:
-                raise ValueError("Modbus client not initialized. Call set_connection_params first.")
-
-            if function_code == 1:
-                result = self.modbus_client.read_coils(address, count, slave=slave_address)
-            elif function_code == 2:
-                result = self.modbus_client.read_discrete_inputs(address, count, slave=slave_address)
-            elif function_code == 3:
-                result = self.modbus_client.read_holding_registers(address, count, slave=slave_address)
-            elif function_code == 4:
-                result = self.modbus_client.read_input_registers(address, count, slave=slave_address)
-            else:
-                logger.error(f"Unsupported function code: {function_code}")
-                return None
-
-            if not result.isError():
-                raw_value = result.registers[0] if hasattr(result, 'registers') else result.bits[0]
-                scaled_value = raw_value * mapping['ScaleFactor'] + mapping['Offset']
-                
-                self.last_values[(slave_address, mapping['MappingId'])] = scaled_value
-                
-                if mapping['MappedTable'] == 'Weighbridge' and mapping['MappedColumn'] == 'CurrentWeight':
-                    weighbridge_id = mapping['MappedEntityId']
+            self.wait_for_bus()
+            result = read(block.start, block.count, slave=slave_address)
+            self.last_transaction = time.monotonic()
+
+            if result.isError():
+                logger.error(f"Error reading registers {block.start}-{block.start + block.count - 1} from slave {slave_address}: {result}")
+                return {}
+
+            raw_values = getattr(result, values_attr)
+            data = {}
+            for offset, mapping_id, scale_factor, bias, weighbridge_id in block.fields:
+                scaled_value = raw_values[offset] * scale_factor + bias
+                self.last_values[(slave_address, mapping_id)] = scaled_value
+                if weighbridge_id is not None:
                     self.current_weight_updated.emit(weighbridge_id, scaled_value)
                 else:
-                    self.update_database_value(mapping['MappingId'], scaled_value)
-                
-                logger.info(f"Successfully read value {scaled_value} from register {address} of slave {slave_address}")
-                return scaled_value
-            else:
-                logger.error(f"Error reading register {address} from slave {slave_address}: {result}")
-                return None
+                    updates.append((mapping_id, scaled_value))
+                data[mapping_id] = scaled_value
+            return data
         except ModbusException as e:
-            logger.error(f"Modbus exception when reading register {address} from slave {slave_address}: {e}")
+            logger.error(f"Modbus exception when reading registers {block.start}-{block.start + block.count - 1} from slave {slave_address}: {e}")
+            self.last_transaction = time.monotonic()
             self.error_occurred.emit(f"Modbus read error: {str(e)}")
-            return None
-
-    def update_database_value(self, mapping_id: int, value: float):
-        try:
-            self.execute_stored_procedure('UpdateMappedModbusValue', (mapping_id, value))
-            logger.info(f"Updated database for mapping {mapping_id} with value {value}")
-        except Exception as e:
-            logger.error(f"Error updating database for mapping {mapping_id}: {e}")
-            self.error_occurred.emit(f"Database update error: {str(e)}")
+            return {}
+
+    def wait_for_bus(self):
+        # RTU frames are delimited by 3.5 character times of silence; keep that gap
+        # and drop any stale bytes left over from a late or partial response
+        remaining = self.silent_interval - (time.monotonic() - self.last_transaction)
+        if remaining > 0:
+            time.sleep(remaining)
+        serial_port = getattr(self.modbus_client, 'socket', None)
+        if serial_port is not None:
+            serial_port.reset_input_buffer()
+
+    def update_database_values(self, updates: List[tuple]):
+        # One round trip and one commit for every (mapping id, value) pair of a read cycle
+        if not updates or self.connection is None:
+            return
+        # While the database is unreachable skip writes; the next cycle carries fresh values
+        if time.monotonic() < self.write_retry_at:
+            return
+        with self.write_lock:
+            try:
+                if self.write_connection is None:
+                    self.write_connection = server_module.get_module_connection(f"{self.__class__.__name__}Writer")
+                    if self.write_connection is None:
+                        raise pyodbc.OperationalError("Could not open the value-write connection")
+                if self.update_cursor is None:
+                    self.update_cursor = self.write_connection.cursor()
+                    self.update_cursor.fast_executemany = True
+                self.update_cursor.executemany(UPDATE_VALUE_SQL, updates)
+                self.write_connection.commit()
+                self.write_backoff = 0.0
+                logger.debug("Updated database with %d mapped values", len(updates))
+            except (pyodbc.OperationalError, pyodbc.InterfaceError) as e:
+                # Connection-level failure: drop the connection and back off instead of retrying every cycle
+                self.close_write_connection()
+                self.write_backoff = min(max(self.write_backoff * 2, WRITE_RETRY_MIN), WRITE_RETRY_MAX)
+                self.write_retry_at = time.monotonic() + self.write_backoff
+                logger.error(f"Database unavailable for mapped value updates, retrying in {self.write_backoff:.1f}s: {e}")
+                self.error_occurred.emit(f"Database update error: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error updating database with {len(updates)} mapped values: {e}")
+                # The next batch starts on a fresh cursor
+                self.update_cursor = None
+                if self.write_connection is not None:
+                    try:
+                        self.write_connection.rollback()
+                    except pyodbc.Error as rollback_error:
+                        logger.error(f"Error rolling back mapped value updates: {rollback_error}")
+                        self.close_write_connection()
+                self.error_occurred.emit(f"Database update error: {str(e)}")
+
+    def close_write_connection(self):
+        if self.write_connection is not None:
+            try:
+                self.write_connection.close()
+            except pyodbc.Error as e:
+                logger.error(f"Error closing value-write connection: {e}")
+        self.write_connection = None
+        self.update_cursor = None
 
-    def read_device_data(self, device: Dict[str, Any]) -> Optional[Dict[int, float]]:
+    def read_device_data(self, device: pyodbc.Row, updates: List[tuple], now: float) -> Optional[Dict[int, float]]:
         try:
-            logger.info(f"Reading data from device {device['SlaveName']} (Address: {device['SlaveAddress']})")
+            slave_address = device.SlaveAddress
             data = {}
-            for mapping in self.register_mappings.get(device['SlaveAddress'], []):
-                result = self.read_register(device['SlaveAddress'], mapping)
-                if result is not None:
-                    data[mapping['MappingId']] = result
-            logger.info(f"Successfully read {len(data)} registers from device {device['SlaveName']}")
+            for index, block in enumerate(self.read_plans.get(slave_address, [])):
+                key = (slave_address, index)
+                if now < self.read_deadlines.get(key, 0.0):
+                    # Not due yet; report the last reading so subscribers still see every mapping
+                    for field in block.fields:
+                        value = self.last_values.get((slave_address, field[1]))
+                        if value is not None:
+                            data[field[1]] = value
+                    continue
+                self.read_deadlines[key] = now + block.interval
+                data.update(self.read_block(slave_address, block, updates))
+            logger.debug("Read %d registers from device %s", len(data), device.SlaveName)
             return data
         except Exception as e:
-            logger.error(f"Error reading from device {device['SlaveName']}: {e}")
+            logger.error(f"Error reading from device {device.SlaveName}: {e}")
             return None
 
     def read_all_slaves(self):
         if not self.is_modbus_connected:
             raise Exception("Modbus not connected. Cannot read slaves.")
         
-        logger.info(f"Starting to read data from {len(self.slaves)} devices")
         new_data = {}
+        updates = []
+        now = time.monotonic()
         for device in self.slaves:
-            logger.info(f"Attempting to read from device: {device}")
-            data = self.read_device_data(device)
+            data = self.read_device_data(device, updates, now)
             if data:
-                logger.info(f"Read data: {data}")
                 new_data.update(data)
             else:
-                logger.warning(f"No data read from device {device['SlaveName']}")
-        logger.info("Finished reading data from all devices")
+                logger.warning("No data read from device %s", device.SlaveName)
+        self.update_database_values(updates)
         return new_data
 
     def start_continuous_reading(self):
-        if self.reader_thread is None or not self.reader_thread.isRunning():
+        if self.reader_thread is None:
             self.reader_thread = ModbusReaderThread(self)
             self.reader_thread.data_read.connect(self.on_data_read)
             self.reader_thread.start()
 
     def stop_continuous_reading(self):
-        if self.reader_thread and self.reader_thread.isRunning():
+        if self.reader_thread is not None:
             self.reader_thread.stop()
             self.reader_thread.wait()
             self.reader_thread = None
@@ -294,25 +527,12 @@ class ModbusModule(QObject):
         self.data_updated.emit(data)
 
     def get_slave_details(self, slave_address: int) -> Optional[Dict[str, Any]]:
-        query = "SELECT * FROM inventory.ActiveModbus WHERE SlaveAddress = ?"
+        query = SLAVE_QUERY + "WHERE SlaveAddress = ?"
         results = self.execute_query(query, params=(slave_address,))
         return results[0] if results else None
 
     def get_register_mapping_details(self, mapping_id: int) -> Optional[Dict[str, Any]]:
-        query = """
-        SELECT rm.*, m.SlaveName, 
-               CASE 
-                   WHEN rm.MappedTable = 'StorageTank' THEN st.StorageTankName
-                   WHEN rm.MappedTable = 'LoadingArm' THEN la.LoadingArmName
-                   WHEN rm.MappedTable = 'Weighbridge' THEN wb.WeighbridgeName
-               END AS EntityName
-        FROM inventory.ActiveRegisterMapping rm
-        JOIN inventory.ActiveModbus m ON rm.SlaveAddress = m.SlaveAddress
-        LEFT JOIN inventory.ActiveStorageTank st ON rm.MappedTable = 'StorageTank' AND rm.MappedEntityId = st.StorageTankId
-        LEFT JOIN inventory.ActiveLoadingArm la ON rm.MappedTable = 'LoadingArm' AND rm.MappedEntityId = la.LoadingArmId
-        LEFT JOIN inventory.ActiveWeighbridge wb ON rm.MappedTable = 'Weighbridge' AND rm.MappedEntityId = wb.WeighbridgeId
-        WHERE rm.MappingId = ?
-        """
+        query = REGISTER_MAPPING_QUERY + "WHERE rm.MappingId = ?"
         results = self.execute_query(query, params=(mapping_id,))
         return results[0] if results else None
 
@@ -328,7 +548,7 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error("Failed to add slave")
             return False
-        self.fetch_slaves()
+        self.refresh_slave(slave_address)
         return True
 
     def update_slave(self, slave_address: int, slave_name: str, baudrate: int, port: str, 
@@ -343,7 +563,7 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to update slave with address {slave_address}")
             return False
-        self.fetch_slaves()
+        self.refresh_slave(slave_address)
         return True
 
     def delete_slave(self, slave_address: int) -> bool:
@@ -356,7 +576,7 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to delete slave with address {slave_address}")
             return False
-        self.fetch_slaves()
+        self.refresh_slave(slave_address)
         return True
 
     def add_register_mapping(self, slave_address: int, register_address: int, register_type: str,
@@ -364,18 +584,20 @@ class ModbusModule(QObject):
                              mapped_entity_id: int, scale_factor: float, offset: float,
                              store_historical: bool, is_read_only: bool) -> bool:
         query = """
+        SET NOCOUNT ON;
         INSERT INTO inventory.RegisterMapping 
         (SlaveAddress, RegisterAddress, RegisterType, FunctionCode, MappedTable, MappedColumn, 
         MappedEntityId, ScaleFactor, Offset, StoreHistorical, IsReadOnly)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+        SELECT CAST(SCOPE_IDENTITY() AS int) AS MappingId;
         """
         params = (slave_address, register_address, register_type, function_code, mapped_table,
                   mapped_column, mapped_entity_id, scale_factor, offset, store_historical, is_read_only)
-        result = self.execute_query(query, params=params, fetch=False)
-        if result is None or result[0]['affected_rows'] == 0:
+        result = self.execute_query(query, params=params, commit=True)
+        if not result or result[0]['MappingId'] is None:
             logger.error("Failed to add register mapping")
             return False
-        self.fetch_register_mappings()
+        self.refresh_register_mapping(result[0]['MappingId'])
         return True
 
     def update_register_mapping(self, mapping_id: int, slave_address: int, register_address: int,
@@ -396,7 +618,7 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to update register mapping with ID {mapping_id}")
             return False
-        self.fetch_register_mappings()
+        self.refresh_register_mapping(mapping_id)
         return True
 
     def delete_register_mapping(self, mapping_id: int) -> bool:
@@ -409,18 +631,29 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to delete register mapping with ID {mapping_id}")
             return False
-        self.fetch_register_mappings()
+        self.refresh_register_mapping(mapping_id)
         return True
 
     def get_available_tables(self) -> List[str]:
         return ['StorageTank', 'LoadingArm', 'Weighbridge']
 
     def get_table_columns(self, table_name: str) -> List[str]:
-        query = f"SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '{table_name}'"
-        results = self.execute_query(query)
-        return [row['COLUMN_NAME'] for row in results] if results else []
+        # The schema does not change while connected, so each table is looked up once per connection
+        columns = self.table_columns.get(table_name)
+        if columns is None:
+            query = "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ?"
+            results = self.execute_query(query, params=(table_name,))
+            if not results:
+                return []
+            columns = self.table_columns[table_name] = tuple(row['COLUMN_NAME'] for row in results)
+        # Callers extend the list, so hand out a copy
+        return list(columns)
 
     def get_table_entities(self, table_name: str) -> List[Dict[str, Any]]:
+        # Identifiers cannot be bound as parameters, so only known tables reach the query text
+        if table_name not in self.get_available_tables():
+            logger.error(f"Unknown mapped table: {table_name}")
+            return []
         id_column = f"{table_name}Id"
         name_column = f"{table_name}Name"
         query = f"SELECT {id_column}, {name_column} FROM inventory.Active{table_name}"
@@ -431,7 +664,7 @@ class ModbusModule(QObject):
             if self.connection is None:
                 raise ValueError("Connection not established. Call connect_to_database first.")
             with self.connection.cursor() as cursor:
-                cursor.execute(f"EXEC inventory.{procedure_name} {','.join(['?' for _ in params])}", params)
+                cursor.execute(procedure_call_sql(procedure_name, len(params)), params)
                 self.connection.commit()
         except Exception as e:
             logger.error(f"Error executing stored procedure {procedure_name}: {e}")
@@ -448,7 +681,7 @@ class ModbusModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to update communication status for slave {slave_address}")
             return False
-        self.fetch_slaves()
+        self.refresh_slave(slave_address)
         return True
 
     def get_communication_status(self, slave_address: int) -> Optional[bool]:
@@ -1,12 +1,14 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                               QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QDoubleSpinBox,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+                               QDialog, QFormLayout, QLineEdit, QDoubleSpinBox,
                                QHeaderView, QAbstractItemView, QComboBox, QSpinBox, QCheckBox,
                                QMessageBox, QTabWidget, QTextEdit, QLabel, QDialogButtonBox, QSizePolicy)
-from PySide6.QtCore import Qt, Signal, QTimer, Slot
+from PySide6.QtCore import (Qt, Signal, QTimer, Slot, QObject, QAbstractTableModel, QModelIndex,
+                            QRunnable, QThreadPool, QSignalBlocker)
 from .modbus import ModbusModule, modbus_module
 from ui.ui_styles import apply_styles, Styles, TMSWidget
 from .server import server_module
 import datetime
+from operator import attrgetter
 from typing import Optional, Dict, Any
 import logging
 
@@ -14,6 +16,143 @@ logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.ERROR)
 
+YES = "Yes"
+NO = "No"
+
+def format_flag(value):
+    return YES if value else NO
+
+def configure_table_view(view: QTableView):
+    # Rows are single-line text, so a fixed height spares Qt from measuring each one
+    vertical_header = view.verticalHeader()
+    vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    vertical_header.setDefaultSectionSize(view.fontMetrics().height() + 6)
+    view.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+    view.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+def timestamp_now():
+    return datetime.datetime.now().isoformat(sep=" ", timespec="milliseconds")
+
+class RowTableModel(QAbstractTableModel):
+    """Read-only table of pre-formatted rows; subclasses set HEADERS and row_fields."""
+    HEADERS = []
+    row_fields = None
+    # One converter per column; None formats every column with str
+    formatters = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def format_row(self, item):
+        fields = self.row_fields(item)
+        if self.formatters is None:
+            return tuple(map(str, fields))
+        return tuple(format_value(field) for format_value, field in zip(self.formatters, fields))
+
+    def set_rows(self, items):
+        self.beginResetModel()
+        self._items = list(items)
+        self._rows = [self.format_row(item) for item in self._items]
+        self.endResetModel()
+
+    def item_at(self, row):
+        return self._items[row]
+
+class DeviceTableModel(RowTableModel):
+    HEADERS = ["Slave Address", "Name", "Baudrate", "Port", "Is Active", "Data Bits", "Parity"]
+    row_fields = attrgetter('SlaveAddress', 'SlaveName', 'Baudrate', 'Port', 'IsActive', 'Databits', 'Parity')
+    formatters = (str, str, str, str, format_flag, str, str)
+
+class MappingTableModel(RowTableModel):
+    HEADERS = ["Mapping ID", "Register Address", "Register Type", "Mapped Table", "Mapped Column"]
+    row_fields = attrgetter('MappingId', 'RegisterAddress', 'RegisterType', 'MappedTable', 'MappedColumn')
+
+class DataViewModel(RowTableModel):
+    # Items are (slave address, register address, value, timestamp, mapped entity) tuples
+    HEADERS = ["Slave Address", "Register Address", "Value", "Timestamp", "Mapped Entity"]
+    VALUE_COLUMN = 2
+    TIMESTAMP_COLUMN = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._row_of = {}
+
+    def format_row(self, item):
+        return tuple(map(str, item))
+
+    def set_rows(self, items):
+        self._row_of = {}
+        super().set_rows(items)
+
+    def update_values(self, values, describe, timestamp):
+        # values maps (slave address, mapping id) -> value; describe(mapping_id) gives
+        # (register address, mapped entity) or None for mappings that no longer exist
+        if self._row_of.keys() - values.keys():
+            # Registers went away; start over rather than removing rows one by one
+            self.set_rows([])
+
+        new_keys, new_items = [], []
+        for key, value in values.items():
+            row = self._row_of.get(key)
+            if row is None:
+                details = describe(key[1])
+                if details is not None:
+                    new_keys.append(key)
+                    new_items.append((key[0], details[0], value, timestamp, details[1]))
+            elif self._items[row][self.VALUE_COLUMN] != value:
+                slave_address, register_address, _, _, entity = self._items[row]
+                item = (slave_address, register_address, value, timestamp, entity)
+                self._items[row] = item
+                self._rows[row] = self.format_row(item)
+                self.dataChanged.emit(self.index(row, self.VALUE_COLUMN), self.index(row, self.TIMESTAMP_COLUMN))
+
+        if new_items:
+            first = len(self._items)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_items) - 1)
+            for offset, (key, item) in enumerate(zip(new_keys, new_items)):
+                self._row_of[key] = first + offset
+                self._items.append(item)
+                self._rows.append(self.format_row(item))
+            self.endInsertRows()
+
+class ModbusTaskSignals(QObject):
+    finished = Signal()
+    failed = Signal(str)
+
+class ModbusTask(QRunnable):
+    """Runs a blocking modbus_module call on the global thread pool."""
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        self.signals = ModbusTaskSignals()
+
+    def run(self):
+        try:
+            self.func()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit()
+
 class ModbusWidget(TMSWidget):
     error_occurred = Signal(str)
 
@@ -22,13 +161,30 @@ class ModbusWidget(TMSWidget):
         self.is_connected = False
         apply_styles(self)
         self.modbus_module = modbus_module
+        self._mapping_cache = None
+        self._slave_fetcher = None
+        self._slave_reader = None
+        self.data_view_model = DataViewModel(self)
+        self.data_view_table = None
+        self.error_log = None
         self.init_ui()
-        self.data_update_timer = QTimer(self)
-        self.data_update_timer.timeout.connect(self.update_data_view)
-        self.data_update_timer.start(500)  # Update UI every 500ms for a balance between responsiveness and performance
+
+        # Bursts of data_updated are collapsed into one data view refresh
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(50)
+        self._coalesce_timer.timeout.connect(self.update_data_view)
+
+        # Error messages are appended to the log in batches
+        self._pending_errors = []
+        self._error_stamp = None
+        self._error_flush_timer = QTimer(self)
+        self._error_flush_timer.setSingleShot(True)
+        self._error_flush_timer.setInterval(100)
+        self._error_flush_timer.timeout.connect(self.flush_errors)
+
         self.modbus_module.data_updated.connect(self.on_data_updated)
         server_module.connection_status_changed.connect(self.set_connection_status)
-        logger.info("Data update timer started")
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -37,8 +193,17 @@ class ModbusWidget(TMSWidget):
         self.tab_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         layout.addWidget(self.tab_widget)
         self.create_device_management_tab()
-        self.create_data_view_tab()
-        self.create_error_log_tab()
+
+        # The other tabs start as empty placeholders and are built the first time they are shown
+        self.data_view_tab = QWidget()
+        self.tab_widget.addTab(self.data_view_tab, "Real-time Data")
+        error_log_tab = QWidget()
+        self.tab_widget.addTab(error_log_tab, "Error Log")
+        self._tab_builders = {
+            self.data_view_tab: self.create_data_view_tab,
+            error_log_tab: self.create_error_log_tab,
+        }
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
 
     def create_device_management_tab(self):
         tab = QWidget()
@@ -48,6 +213,12 @@ class ModbusWidget(TMSWidget):
         self.server_status_label = QLabel("Server Not Connected")
         layout.addWidget(self.server_status_label)
 
+        # Controls that need a server connection share one parent, so enabling the
+        # parent gates all of them at once
+        self.connection_controls = QWidget()
+        controls_layout = QVBoxLayout(self.connection_controls)
+        controls_layout.setContentsMargins(0, 0, 0, 0)
+
         # Modbus connection section
         modbus_connection_layout = QHBoxLayout()
         self.modbus_connect_button = QPushButton("Connect Modbus")
@@ -56,15 +227,14 @@ class ModbusWidget(TMSWidget):
         modbus_connection_layout.addWidget(self.modbus_connect_button)
         modbus_connection_layout.addWidget(self.modbus_disconnect_button)
         modbus_connection_layout.addWidget(self.modbus_status_label)
-        layout.addLayout(modbus_connection_layout)
+        controls_layout.addLayout(modbus_connection_layout)
 
         # Read button (now disabled when Modbus is connected)
         self.read_button = QPushButton("Read Slave Devices")
-        layout.addWidget(self.read_button)
+        controls_layout.addWidget(self.read_button)
 
         # Slave Devices section
-        slave_layout = QVBoxLayout()
-        slave_layout.addWidget(QLabel("Slave Devices"))
+        controls_layout.addWidget(QLabel("Slave Devices"))
 
         button_layout = QHBoxLayout()
         self.add_button = QPushButton("Add Device")
@@ -77,16 +247,18 @@ class ModbusWidget(TMSWidget):
             
             button_layout.addWidget(button)
 
-        slave_layout.addLayout(button_layout)
+        controls_layout.addLayout(button_layout)
+        layout.addWidget(self.connection_controls)
 
-        self.device_table = QTableWidget()
-        
+        self.device_table = QTableView()
+        self.device_model = DeviceTableModel(self)
+        self.device_table.setModel(self.device_model)
+        configure_table_view(self.device_table)
+        self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.device_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.device_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.device_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
-        slave_layout.addWidget(self.device_table)
-
-        layout.addLayout(slave_layout)
+        layout.addWidget(self.device_table)
 
         # Connect buttons
         self.modbus_connect_button.clicked.connect(self.open_connection_dialog)
@@ -97,35 +269,37 @@ class ModbusWidget(TMSWidget):
         self.delete_button.clicked.connect(self.delete_device)
         self.refresh_button.clicked.connect(self.refresh_device_table)
         self.register_mapping_button.clicked.connect(self.open_register_mapping_dialog)
-        self.device_table.itemSelectionChanged.connect(self.on_device_selection_changed)
+        self.device_table.selectionModel().selectionChanged.connect(self.on_device_selection_changed)
 
         # Initial button states
         self.update_ui_elements()
 
         self.tab_widget.addTab(tab, "Device Management")
 
-    def create_data_view_tab(self):
-        tab = QWidget()
+    def create_data_view_tab(self, tab: QWidget):
         layout = QVBoxLayout(tab)
 
-        self.data_view_table = QTableWidget()
-        
+        self.data_view_table = QTableView()
+        self.data_view_table.setModel(self.data_view_model)
         self.data_view_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
-        self.data_view_table.setColumnCount(5)  # Set initial column count
-        self.data_view_table.setHorizontalHeaderLabels(["Slave Address", "Register Address", "Value", "Timestamp", "Mapped Entity"])
+        configure_table_view(self.data_view_table)
+        # Fixed widths instead of measuring contents; the entity name takes the remaining space
+        header = self.data_view_table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setDefaultSectionSize(120)
+        header.resizeSection(DataViewModel.TIMESTAMP_COLUMN, 180)
+        header.setStretchLastSection(True)
         layout.addWidget(self.data_view_table)
 
-        self.tab_widget.addTab(tab, "Real-time Data")
-
-    def create_error_log_tab(self):
-        tab = QWidget()
+    def create_error_log_tab(self, tab: QWidget):
         layout = QVBoxLayout(tab)
 
         self.error_log = QTextEdit()
         self.error_log.setReadOnly(True)
+        # Oldest entries are dropped once the log reaches this many lines
+        self.error_log.document().setMaximumBlockCount(2000)
         layout.addWidget(self.error_log)
-
-        self.tab_widget.addTab(tab, "Error Log")
+        self.flush_errors()
 
     def set_connection_status(self, is_connected: bool, message: str):
         self.is_connected = is_connected
@@ -142,11 +316,7 @@ class ModbusWidget(TMSWidget):
         pass
         
     def update_ui_elements(self):
-        enabled = self.is_connected
-        for widget in [self.modbus_connect_button, self.modbus_disconnect_button, 
-                       self.read_button, self.add_button, self.edit_button, 
-                       self.delete_button, self.refresh_button, self.register_mapping_button]:
-            widget.setEnabled(enabled)
+        self.connection_controls.setEnabled(self.is_connected)
 
     def connect_to_database(self):
         try:
@@ -160,7 +330,7 @@ class ModbusWidget(TMSWidget):
         try:
             self.modbus_module.disconnect_from_database()
             logger.info("Database disconnected successfully")
-            self.device_table.setRowCount(0)
+            self.device_model.set_rows([])
         except Exception as e:
             self.log_error(f"Database disconnection error: {str(e)}")
 
@@ -194,40 +364,57 @@ class ModbusWidget(TMSWidget):
             self.log_error(f"Modbus disconnection error: {str(e)}")
 
     def read_slaves(self):
-        try:
-            self.modbus_module.read_all_slaves()
-            self.log_error("Successfully read all slave devices")
-            self.update_data_view()
-        except Exception as e:
-            self.log_error(f"Error reading slave devices: {str(e)}")
+        if self._slave_reader is not None:
+            return
+
+        self.read_button.setEnabled(False)
+        self._slave_reader = ModbusTask(self.modbus_module.read_all_slaves)
+        self._slave_reader.signals.finished.connect(self._on_slaves_read)
+        self._slave_reader.signals.failed.connect(self._on_slaves_read_failed)
+        QThreadPool.globalInstance().start(self._slave_reader)
+
+    @Slot()
+    def _on_slaves_read(self):
+        self._slave_reader = None
+        self.read_button.setEnabled(not self.modbus_module.is_modbus_connected)
+        self.log_error("Successfully read all slave devices")
+        self.update_data_view()
+
+    @Slot(str)
+    def _on_slaves_read_failed(self, message: str):
+        self._slave_reader = None
+        self.read_button.setEnabled(not self.modbus_module.is_modbus_connected)
+        self.log_error(f"Error reading slave devices: {message}")
 
     def refresh_device_table(self):
-        if not self.modbus_module.is_connected:
+        if not self.modbus_module.is_connected or self._slave_fetcher is not None:
             return
 
-        try:
-            self.modbus_module.fetch_slaves()
-            devices = self.modbus_module.slaves
-            self.device_table.setRowCount(len(devices))
-            self.device_table.setColumnCount(7)
-            self.device_table.setHorizontalHeaderLabels([
-                "Slave Address", "Name", "Baudrate", "Port", "Is Active", "Data Bits", "Parity"
-            ])
-
-            for row, device in enumerate(devices):
-                self.device_table.setItem(row, 0, QTableWidgetItem(str(device['SlaveAddress'])))
-                self.device_table.setItem(row, 1, QTableWidgetItem(device['SlaveName']))
-                self.device_table.setItem(row, 2, QTableWidgetItem(str(device['Baudrate'])))
-                self.device_table.setItem(row, 3, QTableWidgetItem(device['Port']))
-                self.device_table.setItem(row, 4, QTableWidgetItem(str(device['IsActive'])))
-                self.device_table.setItem(row, 5, QTableWidgetItem(str(device['Databits'])))
-                self.device_table.setItem(row, 6, QTableWidgetItem(device['Parity']))
-
-            self.device_table.resizeColumnsToContents()
-            self.device_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        except Exception as e:
-            logger.error(f"Error refreshing device table: {str(e)}")
-            self.log_error(f"Error refreshing device table: {str(e)}")
+        self.refresh_button.setEnabled(False)
+        self._slave_fetcher = ModbusTask(self.modbus_module.fetch_slaves)
+        self._slave_fetcher.signals.finished.connect(self._on_slaves_fetched)
+        self._slave_fetcher.signals.failed.connect(self._on_slaves_fetch_failed)
+        QThreadPool.globalInstance().start(self._slave_fetcher)
+
+    @Slot()
+    def _on_slaves_fetched(self):
+        self._slave_fetcher = None
+        self.refresh_button.setEnabled(True)
+        self.show_slaves()
+
+    @Slot(str)
+    def _on_slaves_fetch_failed(self, message: str):
+        self._slave_fetcher = None
+        self.refresh_button.setEnabled(True)
+        logger.error(f"Error refreshing device table: {message}")
+        self.log_error(f"Error refreshing device table: {message}")
+
+    def show_slaves(self):
+        # The reset drops the selection; settle the button state once afterwards
+        with QSignalBlocker(self.device_table.selectionModel()):
+            self.device_model.set_rows(self.modbus_module.slaves)
+        self.on_device_selection_changed()
+        self.invalidate_mapping_details()
 
     def add_device(self):
         if not self.modbus_module.is_connected:
@@ -238,7 +425,7 @@ class ModbusWidget(TMSWidget):
             try:
                 if self.modbus_module.add_slave(**data):
                     logger.info("Device added successfully.")
-                    self.refresh_device_table()
+                    self.show_slaves()
                 else:
                     logger.error("Failed to add device.")
                     self.log_error("Failed to add device.")
@@ -249,16 +436,15 @@ class ModbusWidget(TMSWidget):
     def edit_device(self):
         if not self.modbus_module.is_connected:
             return
-        selected_row = self.device_table.currentRow()
-        if 0 <= selected_row < self.device_table.rowCount():
-            slave_address = int(self.device_table.item(selected_row, 0).text())
+        slave_address = self.selected_slave_address()
+        if slave_address is not None:
             dialog = ModbusDeviceDialog(self, slave_address)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 data = dialog.get_data()
                 try:
                     if self.modbus_module.update_slave(**data):
                         logger.info("Device updated successfully.")
-                        self.refresh_device_table()
+                        self.show_slaves()
                     else:
                         logger.error("Failed to update device.")
                         self.log_error("Failed to update device.")
@@ -271,16 +457,15 @@ class ModbusWidget(TMSWidget):
     def delete_device(self):
         if not self.modbus_module.is_connected:
             return
-        selected_row = self.device_table.currentRow()
-        if 0 <= selected_row < self.device_table.rowCount():
-            slave_address = int(self.device_table.item(selected_row, 0).text())
+        slave_address = self.selected_slave_address()
+        if slave_address is not None:
             confirm = QMessageBox.question(self, "Confirm Deletion", "Are you sure you want to delete this device?",
                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if confirm == QMessageBox.StandardButton.Yes:
                 try:
                     if self.modbus_module.delete_slave(slave_address):
                         logger.info(f"Device {slave_address} deleted successfully.")
-                        self.refresh_device_table()
+                        self.show_slaves()
                     else:
                         logger.error(f"Failed to delete device {slave_address}.")
                         self.log_error(f"Failed to delete device {slave_address}.")
@@ -290,51 +475,67 @@ class ModbusWidget(TMSWidget):
         else:
             logger.warning("No device selected for deletion.")
 
+    def selected_slave_address(self) -> Optional[int]:
+        index = self.device_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.device_model.item_at(index.row()).SlaveAddress
+
     def on_device_selection_changed(self):
-        self.register_mapping_button.setEnabled(len(self.device_table.selectedItems()) > 0)
+        self.register_mapping_button.setEnabled(self.device_table.selectionModel().hasSelection())
 
     def open_register_mapping_dialog(self):
-        selected_row = self.device_table.currentRow()
-        if 0 <= selected_row < self.device_table.rowCount():
-            slave_address = int(self.device_table.item(selected_row, 0).text())
+        slave_address = self.selected_slave_address()
+        if slave_address is not None:
             dialog = RegisterMappingDialog(self, self.modbus_module, slave_address)
             dialog.exec()
 
     @Slot(dict)
     def on_data_updated(self, data):
-        self.update_data_view(data)
+        # The payload shape differs between the reader and the fetch methods; the module's
+        # last_values is always the complete (slave address, mapping id) -> value snapshot
+        if self.tab_widget.currentWidget() is not self.data_view_tab:
+            # Nothing to paint; on_tab_changed catches up when the tab is shown
+            return
+        if not self._coalesce_timer.isActive():
+            self._coalesce_timer.start()
+
+    def on_tab_changed(self, index: int):
+        tab = self.tab_widget.widget(index)
+        builder = self._tab_builders.pop(tab, None)
+        if builder is not None:
+            builder(tab)
+        if tab is self.data_view_tab:
+            self.update_data_view()
 
-    def update_data_view(self, latest_data=None):
+    def describe_mapping(self, mapping_id: int):
+        # Built from the module's cached mappings, so the data view never queries the database
+        if self._mapping_cache is None:
+            self._mapping_cache = {
+                mapping.MappingId: (mapping.RegisterAddress, f"{mapping.MappedTable}.{mapping.MappedColumn}")
+                for mappings in self.modbus_module.register_mappings.values()
+                for mapping in mappings
+            }
+        details = self._mapping_cache.get(mapping_id)
+        if details is None:
+            logger.warning(f"No mapping found for mapping_id: {mapping_id}")
+        return details
+
+    def invalidate_mapping_details(self):
+        # Rows keep the description they were created with, so drop them too
+        self._mapping_cache = None
+        self.data_view_model.set_rows([])
+
+    def update_data_view(self):
         if self.modbus_module.is_modbus_connected:
             try:
-                if latest_data is None:
-                    latest_data = self.modbus_module.last_values
-                
-                logger.info(f"Updating data view with data: {latest_data}")
-                
+                # The reader thread keeps writing last_values; copy() takes it in one step
+                latest_data = self.modbus_module.last_values.copy()
                 if not latest_data:
-                    logger.warning("No data available to update the view")
                     return
 
-                self.data_view_table.setRowCount(len(latest_data))
-                self.data_view_table.setColumnCount(5)
-                self.data_view_table.setHorizontalHeaderLabels(["Slave Address", "Register Address", "Value", "Timestamp", "Mapped Entity"])
-
-                row = 0
-                for (slave_address, mapping_id), value in latest_data.items():
-                    mapping = self.modbus_module.get_register_mapping_details(mapping_id)
-                    if mapping:
-                        self.data_view_table.setItem(row, 0, QTableWidgetItem(str(slave_address)))
-                        self.data_view_table.setItem(row, 1, QTableWidgetItem(str(mapping['RegisterAddress'])))
-                        self.data_view_table.setItem(row, 2, QTableWidgetItem(str(value)))
-                        self.data_view_table.setItem(row, 3, QTableWidgetItem(str(datetime.datetime.now())))
-                        self.data_view_table.setItem(row, 4, QTableWidgetItem(f"{mapping['MappedTable']}.{mapping['MappedColumn']}"))
-                        row += 1
-                    else:
-                        logger.warning(f"No mapping found for mapping_id: {mapping_id}")
-
-                self.data_view_table.resizeColumnsToContents()
-                logger.info(f"Updated data view with {row} rows of data")
+                # One formatted stamp per refresh, shared by every row it touches
+                self.data_view_model.update_values(latest_data, self.describe_mapping, timestamp_now())
             except Exception as e:
                 logger.error(f"Error updating data view: {str(e)}", exc_info=True)
                 self.log_error(f"Error updating data view: {str(e)}")
@@ -342,7 +543,32 @@ class ModbusWidget(TMSWidget):
             logger.warning("Modbus not connected, skipping data view update")
 
     def log_error(self, message: str):
-        self.error_log.append(f"{datetime.datetime.now()}: {message}")
+        if not self._error_flush_timer.isActive():
+            # Messages in one flush batch share the stamp taken when the batch opened
+            self._error_stamp = timestamp_now()
+            self._error_flush_timer.start()
+        self._pending_errors.append(f"{self._error_stamp}: {message}")
+
+    def flush_errors(self):
+        if self.error_log is None:
+            # Held until the Error Log tab is first opened; keep only what the log would show
+            del self._pending_errors[:-2000]
+            return
+        messages, self._pending_errors = self._pending_errors, []
+        if messages:
+            self.error_log.append("\n".join(messages))
+
+    def closeEvent(self, event):
+        # Module signals outlive this widget; stop feeding a view that is going away
+        self._coalesce_timer.stop()
+        self._error_flush_timer.stop()
+        for signal, slot in ((self.modbus_module.data_updated, self.on_data_updated),
+                             (server_module.connection_status_changed, self.set_connection_status)):
+            try:
+                signal.disconnect(slot)
+            except (TypeError, RuntimeError):
+                pass
+        super().closeEvent(event)
 
 class ConnectionDialog(QDialog):
     def __init__(self, parent=None):
@@ -363,9 +589,11 @@ class ConnectionDialog(QDialog):
         self.bytesize_input = QComboBox()
         self.bytesize_input.addItems(['7', '8'])
         self.timeout_input = QDoubleSpinBox()
-        self.timeout_input.setRange(0.1, 10)
-        self.timeout_input.setValue(1)
+        self.timeout_input.setRange(0, 10)
         self.timeout_input.setSingleStep(0.1)
+        # Zero lets the module derive the timeout from the baudrate
+        self.timeout_input.setSpecialValueText("Auto")
+        self.timeout_input.setValue(0)
 
         layout.addRow("Port:", self.port_input)
         layout.addRow("Baudrate:", self.baudrate_input)
@@ -386,7 +614,7 @@ class ConnectionDialog(QDialog):
             'parity': self.parity_input.currentText(),
             'stopbits': float(self.stopbits_input.currentText()),
             'bytesize': int(self.bytesize_input.currentText()),
-            'timeout': self.timeout_input.value()
+            'timeout': self.timeout_input.value() or None
         }
 
 class ModbusDeviceDialog(QDialog):
@@ -459,8 +687,11 @@ class RegisterMappingDialog(QDialog):
         layout = QVBoxLayout(self)
 
         # Register Mapping Table
-        self.mapping_table = QTableWidget()
-        
+        self.mapping_table = QTableView()
+        self.mapping_model = MappingTableModel(self)
+        self.mapping_table.setModel(self.mapping_model)
+        configure_table_view(self.mapping_table)
+        self.mapping_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.mapping_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.mapping_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.mapping_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
@@ -486,23 +717,14 @@ class RegisterMappingDialog(QDialog):
         self.refresh_mapping_table()
 
     def refresh_mapping_table(self):
-        self.modbus_module.fetch_register_mappings()
-        mappings = [mapping for mapping in self.modbus_module.register_mappings.get(self.slave_address, [])]
-        self.mapping_table.setRowCount(len(mappings))
-        self.mapping_table.setColumnCount(5)
-        self.mapping_table.setHorizontalHeaderLabels([
-            "Mapping ID", "Register Address", "Register Type", "Mapped Table", "Mapped Column"
-        ])
-
-        for row, mapping in enumerate(mappings):
-            self.mapping_table.setItem(row, 0, QTableWidgetItem(str(mapping['MappingId'])))
-            self.mapping_table.setItem(row, 1, QTableWidgetItem(str(mapping['RegisterAddress'])))
-            self.mapping_table.setItem(row, 2, QTableWidgetItem(mapping['RegisterType']))
-            self.mapping_table.setItem(row, 3, QTableWidgetItem(mapping['MappedTable']))
-            self.mapping_table.setItem(row, 4, QTableWidgetItem(mapping['MappedColumn']))
-
-        self.mapping_table.resizeColumnsToContents()
-        self.mapping_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        # The module keeps register_mappings current after every edit, so no refetch is needed
+        self.mapping_model.set_rows(self.modbus_module.register_mappings.get(self.slave_address, ()))
+
+    def selected_mapping_id(self) -> Optional[int]:
+        index = self.mapping_table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.mapping_model.item_at(index.row()).MappingId
 
     def add_mapping(self):
         dialog = MappingDetailDialog(self, self.modbus_module, self.slave_address)
@@ -511,6 +733,7 @@ class RegisterMappingDialog(QDialog):
             try:
                 if self.modbus_module.add_register_mapping(self.slave_address, **mapping_data):
                     logger.info("Register mapping added successfully.")
+                    self.parent().invalidate_mapping_details()
                     self.refresh_mapping_table()
                 else:
                     logger.error("Failed to add register mapping.")
@@ -520,9 +743,8 @@ class RegisterMappingDialog(QDialog):
                 QMessageBox.critical(self, "Error", f"Error adding register mapping: {str(e)}")
 
     def edit_mapping(self):
-        selected_row = self.mapping_table.currentRow()
-        if 0 <= selected_row < self.mapping_table.rowCount():
-            mapping_id = int(self.mapping_table.item(selected_row, 0).text())
+        mapping_id = self.selected_mapping_id()
+        if mapping_id is not None:
             current_mapping = self.modbus_module.get_register_mapping_details(mapping_id)
             if current_mapping:
                 dialog = MappingDetailDialog(self, self.modbus_module, self.slave_address, current_mapping)
@@ -531,6 +753,7 @@ class RegisterMappingDialog(QDialog):
                     try:
                         if self.modbus_module.update_register_mapping(mapping_id, self.slave_address, **updated_mapping):
                             logger.info("Register mapping updated successfully.")
+                            self.parent().invalidate_mapping_details()
                             self.refresh_mapping_table()
                         else:
                             logger.error("Failed to update register mapping.")
@@ -545,15 +768,15 @@ class RegisterMappingDialog(QDialog):
             QMessageBox.warning(self, "Warning", "No mapping selected for editing.")
 
     def delete_mapping(self):
-        selected_row = self.mapping_table.currentRow()
-        if 0 <= selected_row < self.mapping_table.rowCount():
-            mapping_id = int(self.mapping_table.item(selected_row, 0).text())
+        mapping_id = self.selected_mapping_id()
+        if mapping_id is not None:
             confirm = QMessageBox.question(self, "Confirm Deletion", "Are you sure you want to delete this mapping?",
                                            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if confirm == QMessageBox.StandardButton.Yes:
                 try:
                     if self.modbus_module.delete_register_mapping(mapping_id):
                         logger.info(f"Register mapping {mapping_id} deleted successfully.")
+                        self.parent().invalidate_mapping_details()
                         self.refresh_mapping_table()
                     else:
                         logger.error(f"Failed to delete register mapping {mapping_id}.")
@@ -1,18 +1,91 @@
-from PySide6.QtCore import QObject, Signal, Slot
+from PySide6.QtCore import QObject, Signal, Slot, QRunnable, QThreadPool
 from .server import server_module
+from collections import OrderedDict
+from threading import Lock
 import logging
 from typing import List, Dict, Any, Optional
+import time
 
 logger = logging.getLogger(__name__)
 
+PRODUCT_SELECT = """
+SELECT 
+    p.ProductId, p.ProductCode, p.ProductName, p.Description, p.Density, p.State,
+    p.CurrentReserve, p.UnitId, u.UnitName, s.StorageTankId, s.StorageTankName
+FROM inventory.ActiveProduct p
+LEFT JOIN inventory.ActiveUnit u ON p.UnitId = u.UnitId
+LEFT JOIN inventory.ActiveStorageTank s ON p.ProductId = s.ProductId
+"""
+# ProductId breaks name ties so every product list query returns rows in one stable order
+PRODUCT_ORDER = "ORDER BY p.ProductName, p.ProductId"
+PRODUCT_SEARCH_FILTER = "(p.ProductCode LIKE ? OR p.ProductName LIKE ?)"
+PRODUCT_UPDATE_SQL = """
+UPDATE inventory.Product
+SET ProductCode=?, ProductName=?, Description=?, Density=?, State=?, 
+    CurrentReserve=?, UnitId=?, LastModifiedDate=GETDATE()
+WHERE ProductId=?
+"""
+STORAGE_TANK_ASSIGN_SQL = """
+UPDATE inventory.StorageTank
+SET ProductId = CASE WHEN ? IS NULL THEN NULL ELSE ? END
+WHERE StorageTankId = ? OR ProductId = ?
+"""
+UNITS_QUERY = "SELECT UnitId, UnitName FROM inventory.ActiveUnit"
+STORAGE_TANKS_QUERY = "SELECT StorageTankId, StorageTankName, ProductId FROM inventory.ActiveStorageTank"
+# Units and tanks change rarely; dialogs reuse them for this many seconds
+REFERENCE_TTL = 60.0
+DETAILS_CACHE_SIZE = 128
+# SQL Server accepts at most 2100 parameters per statement
+DELETE_BATCH_SIZE = 1000
+
+def product_update_params(product_data: Dict[str, Any]) -> tuple:
+    return (
+        product_data['ProductCode'], product_data['ProductName'], product_data['Description'],
+        product_data['Density'], product_data['State'], product_data['CurrentReserve'],
+        product_data['UnitId'], product_data['ProductId']
+    )
+
+def storage_tank_assign_params(product_data: Dict[str, Any]) -> tuple:
+    return (product_data['StorageTankId'], product_data['ProductId'],
+            product_data['StorageTankId'], product_data['ProductId'])
+
+class ProductTask(QRunnable):
+    """Runs a ProductModule read on its list pool; results arrive through its signals."""
+
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+
+    def run(self):
+        self.func(*self.args)
+
 class ProductModule(QObject):
     data_updated = Signal()
     error_occurred = Signal(str)
 
     def __init__(self):
         super().__init__()
-        self.products: List[Dict[str, Any]] = []
+        # pyodbc rows; columns are read as attributes
+        self.products: List[Any] = []
+        # Search behind self.products, None when the full list is shown
+        self.search_term: Optional[str] = None
         self.connection = None
+        # Reads get their own autocommit connection so pooled fetches never queue behind a write
+        self.read_connection = None
+        # One long-lived cursor serves every read; pool threads and the GUI thread share it
+        self.read_cursor = None
+        self.query_lock = Lock()
+        # Write SQL text -> open cursor; pyodbc keeps the statement prepared while its cursor lives
+        self.write_cursors = {}
+        # Reference query -> (fetched at, rows), dropped on every product write
+        self.reference_cache = {}
+        # Recently opened product details, most recent last
+        self.details_cache = OrderedDict()
+        # Every task that replaces self.products runs here, one at a time and in submission order,
+        # so an older fetch or search can never land after a newer one
+        self.list_pool = QThreadPool(self)
+        self.list_pool.setMaxThreadCount(1)
         server_module.connection_status_changed.connect(self.on_connection_status_changed)
 
     @Slot(bool, str)
@@ -26,6 +99,9 @@ class ProductModule(QObject):
         try:
             self.connection = server_module.get_module_connection(self.__class__.__name__)
             if self.connection:
+                self.read_connection = server_module.get_module_connection(self.__class__.__name__)
+            if self.connection and self.read_connection:
+                self.read_connection.autocommit = True
                 logger.info(f"{self.__class__.__name__} connected to database")
                 self.fetch_products()
             else:
@@ -36,62 +112,125 @@ class ProductModule(QObject):
             self.error_occurred.emit(f"Error connecting to database: {str(e)}")
 
     def disconnect_from_database(self):
+        # Queued list loads would only fail against the closed connections
+        self.list_pool.clear()
+        if self.read_connection:
+            with self.query_lock:
+                try:
+                    server_module.release_module_connection(self.__class__.__name__, self.read_connection)
+                except Exception as e:
+                    logger.exception(f"Error closing read connection: {e}")
+                finally:
+                    self.read_cursor = None
+                    self.read_connection = None
         if self.connection:
             try:
-                self.connection.close()
+                server_module.release_module_connection(self.__class__.__name__, self.connection)
                 logger.info("ProductModule disconnected from database")
             except Exception as e:
                 logger.exception(f"Error disconnecting from database: {e}")
             finally:
                 self.connection = None
+                self.write_cursors = {}
                 self.products = []
+                self.search_term = None
+                self.reference_cache = {}
+                self.details_cache.clear()
 
-    def execute_query(self, query: str, params: tuple = (), fetch: bool = True) -> Optional[List[Dict[str, Any]]]:
-        if not self.connection:
+    def execute_query(self, query: str, params: tuple = (), fetch: bool = True,
+                      fetch_raw: bool = False) -> Optional[List[Any]]:
+        if not self.connection or not self.read_connection:
             logger.error("No active database connection")
             self.error_occurred.emit("No active database connection")
             return None
         
         try:
-            with self.connection.cursor() as cursor:
-                cursor.execute(query, params)
-                if fetch:
+            if fetch:
+                with self.query_lock:
+                    cursor = self.get_read_cursor()
+                    cursor.execute(query, params)
+                    if fetch_raw:
+                        # pyodbc.Row already offers attribute access; skip building a dict per row
+                        return cursor.fetchall()
                     columns = [column[0] for column in cursor.description]
                     return [dict(zip(columns, row)) for row in cursor.fetchall()]
-                else:
-                    self.connection.commit()
-                    return [{"affected_rows": cursor.rowcount}]
+            # Writes only come from the GUI thread, and their SQL text is fixed per method
+            cursor = self.write_cursors.get(query)
+            if cursor is None:
+                cursor = self.write_cursors[query] = self.connection.cursor()
+            cursor.execute(query, params)
+            # Statements with an OUTPUT clause hand back the written rows
+            output = cursor.fetchall() if cursor.description else []
+            self.connection.commit()
+            return [{"affected_rows": cursor.rowcount, "output": output}]
         except Exception as e:
             logger.exception(f"Error executing query: {e}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
-            self.connection.rollback()
+            if fetch:
+                self.read_cursor = None
+            else:
+                # Start the statement over on a fresh cursor next time
+                self.write_cursors.pop(query, None)
+                self.connection.rollback()
+            self.error_occurred.emit(f"Error executing query: {str(e)}")
+            return None
+
+    def get_read_cursor(self):
+        # Called with query_lock held; a failed read drops the cursor so the next one starts clean
+        if self.read_cursor is None:
+            self.read_cursor = self.read_connection.cursor()
+        return self.read_cursor
+
+    def execute_batch(self, queries: List[str]) -> Optional[List[List[Any]]]:
+        # Several SELECTs in one round trip; one list of pyodbc rows per statement
+        if not self.read_connection:
+            logger.error("No active database connection")
+            self.error_occurred.emit("No active database connection")
+            return None
+
+        try:
+            with self.query_lock:
+                cursor = self.get_read_cursor()
+                cursor.execute(";\n".join(queries))
+                results = []
+                while True:
+                    results.append(cursor.fetchall())
+                    if not cursor.nextset():
+                        return results
+        except Exception as e:
+            logger.exception(f"Error executing batch: {e}")
+            self.read_cursor = None
             self.error_occurred.emit(f"Error executing query: {str(e)}")
             return None
 
     def fetch_products(self):
-        query = """
-        SELECT 
-            p.ProductId, p.ProductCode, p.ProductName, p.Description, p.Density, p.State,
-            p.CurrentReserve, u.UnitName, s.StorageTankName
-        FROM inventory.ActiveProduct p
-        LEFT JOIN inventory.ActiveUnit u ON p.UnitId = u.UnitId
-        LEFT JOIN inventory.ActiveStorageTank s ON p.ProductId = s.ProductId
-        ORDER BY p.ProductName
-        """
-        results = self.execute_query(query)
+        self.list_pool.start(ProductTask(self.load_products))
+
+    def load_products(self):
+        # Units and tanks ride along so the product dialog opens without its own queries
+        results = self.execute_batch([PRODUCT_SELECT + PRODUCT_ORDER, UNITS_QUERY, STORAGE_TANKS_QUERY])
         if results is not None:
-            self.products = results
+            self.products, units, storage_tanks = results
+            self.search_term = None
+            fetched_at = time.monotonic()
+            self.reference_cache[UNITS_QUERY] = (fetched_at, units)
+            self.reference_cache[STORAGE_TANKS_QUERY] = (fetched_at, storage_tanks)
             self.data_updated.emit()
         else:
             logger.error("Failed to fetch products")
             self.error_occurred.emit("Failed to fetch products")
 
-    def get_product_details(self, product_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    def get_product_details(self, product_id: Optional[str], cache: bool = True) -> Optional[Dict[str, Any]]:
         if product_id is None:
             logger.error("get_product_details called with None product_id")
             return None
 
+        if cache and product_id in self.details_cache:
+            self.details_cache.move_to_end(product_id)
+            # Callers get their own copy so edits to it never leak into the cache
+            return dict(self.details_cache[product_id])
+
         query = """
         SELECT 
             p.ProductId, p.ProductCode, p.ProductName, p.Description, p.Density, p.State,
@@ -101,12 +240,19 @@ class ProductModule(QObject):
         WHERE p.ProductId = ?
         """
         results = self.execute_query(query, params=(product_id,))
-        return results[0] if results and isinstance(results, list) else None
+        if not results or not isinstance(results, list):
+            return None
+        self.details_cache[product_id] = results[0]
+        self.details_cache.move_to_end(product_id)
+        if len(self.details_cache) > DETAILS_CACHE_SIZE:
+            self.details_cache.popitem(last=False)
+        return dict(results[0])
 
     def add_product(self, product_data: Dict[str, Any]) -> bool:
         query = """
         INSERT INTO inventory.Product 
         (ProductCode, ProductName, Description, Density, State, CurrentReserve, UnitId)
+        OUTPUT inserted.ProductId
         VALUES (?, ?, ?, ?, ?, ?, ?)
         """
         params = (
@@ -115,9 +261,11 @@ class ProductModule(QObject):
             product_data['UnitId']
         )
         result = self.execute_query(query, params=params, fetch=False)
-        if result is None or result[0]['affected_rows'] == 0:
+        if result is None or not result[0]['output']:
             logger.error("Failed to add product")
             return False
+        self.reference_cache.clear()
+        self.refresh_products([result[0]['output'][0].ProductId])
         return True
 
     def update_product(self, product_data: Dict[str, Any]) -> bool:
@@ -126,41 +274,32 @@ class ProductModule(QObject):
             self.error_occurred.emit("No active database connection")
             return False
 
+        # Products listed with the tank being assigned lose it, so their rows are re-read too
+        product_id = product_data['ProductId']
+        tank_id = product_data['StorageTankId']
+        touched = [product_id]
+        if tank_id is not None:
+            touched += [product.ProductId for product in self.products if product.StorageTankId == tank_id]
+
         try:
             cursor = self.connection.cursor()
             
             # Start transaction
             cursor.execute("BEGIN TRANSACTION")
             
-            query = """
-            UPDATE inventory.Product
-            SET ProductCode=?, ProductName=?, Description=?, Density=?, State=?, 
-                CurrentReserve=?, UnitId=?, LastModifiedDate=GETDATE()
-            WHERE ProductId=?
-            """
-            params = (
-                product_data['ProductCode'], product_data['ProductName'], product_data['Description'],
-                product_data['Density'], product_data['State'], product_data['CurrentReserve'],
-                product_data['UnitId'], product_data['ProductId']
-            )
-            cursor.execute(query, params)
+            cursor.execute(PRODUCT_UPDATE_SQL, product_update_params(product_data))
             
             if cursor.rowcount == 0:
                 raise Exception("Failed to update product in the Product table")
             
-            storage_tank_query = """
-            UPDATE inventory.StorageTank
-            SET ProductId = CASE WHEN ? IS NULL THEN NULL ELSE ? END
-            WHERE StorageTankId = ? OR ProductId = ?
-            """
-            storage_tank_params = (product_data['StorageTankId'], product_data['ProductId'], 
-                                product_data['StorageTankId'], product_data['ProductId'])
-            cursor.execute(storage_tank_query, storage_tank_params)
+            cursor.execute(STORAGE_TANK_ASSIGN_SQL, storage_tank_assign_params(product_data))
             
             # Commit transaction
             self.connection.commit()
+            self.reference_cache.clear()
+            # The tank update can take a tank away from another product, so drop every entry
+            self.details_cache.clear()
             logger.info(f"Product {product_data['ProductId']} updated successfully")
-            return True
         except Exception as e:
             # Rollback transaction
             self.connection.rollback()
@@ -170,6 +309,68 @@ class ProductModule(QObject):
         finally:
             cursor.close()
 
+        self.refresh_products(touched)
+        return True
+
+    def refresh_products(self, product_ids: List[Any]):
+        # Queued behind any fetch or search still running, so the patch applies to the newest list
+        self.list_pool.start(ProductTask(self.load_refreshed_products, product_ids))
+
+    def load_refreshed_products(self, product_ids: List[Any]):
+        # Re-read only the products a write touched instead of refetching the whole list
+        product_ids = list(dict.fromkeys(product_ids))
+        placeholders = ", ".join("?" * len(product_ids))
+        query = PRODUCT_SELECT + f"WHERE p.ProductId IN ({placeholders})"
+        params = tuple(product_ids)
+        if self.search_term is not None:
+            # Rows that no longer match the active search drop out of the list
+            query += f" AND {PRODUCT_SEARCH_FILTER}"
+            search_param = f"%{self.search_term}%"
+            params += (search_param, search_param)
+        rows = self.execute_query(query, params=params, fetch_raw=True)
+        if rows is None:
+            self.reload_products()
+            return
+
+        # A product with several tanks has one row per tank, so every row of a touched product is replaced
+        rows_by_id = {}
+        for row in rows:
+            rows_by_id.setdefault(row.ProductId, []).append(row)
+        listed_names = {product.ProductId: product.ProductName for product in self.products}
+        if any(listed_names.get(product_id, object()) != product_rows[0].ProductName
+               for product_id, product_rows in rows_by_id.items()):
+            # A new or renamed product has to be placed by the server's collation, so reload
+            self.reload_products()
+            return
+
+        touched = set(product_ids)
+        placed = set()
+        products = []
+        for product in self.products:
+            product_id = product.ProductId
+            if product_id not in touched:
+                products.append(product)
+            elif product_id not in placed:
+                placed.add(product_id)
+                products.extend(rows_by_id.get(product_id, ()))
+        self.products = products
+        self.data_updated.emit()
+
+    def reload_products(self):
+        # Runs on the list pool; repeats whichever load produced the current list
+        if self.search_term is None:
+            self.load_products()
+        else:
+            self.load_search_results(self.search_term)
+
+    def drop_products(self, product_ids: List[Any]):
+        self.list_pool.start(ProductTask(self.remove_dropped_products, product_ids))
+
+    def remove_dropped_products(self, product_ids: List[Any]):
+        removed = set(product_ids)
+        self.products = [product for product in self.products if product.ProductId not in removed]
+        self.data_updated.emit()
+
     def delete_product(self, product_id: str) -> bool:
         query = """
         UPDATE inventory.Product
@@ -180,34 +381,77 @@ class ProductModule(QObject):
         if result is None or result[0]['affected_rows'] == 0:
             logger.error(f"Failed to delete product with ID {product_id}")
             return False
+        self.reference_cache.clear()
+        self.details_cache.pop(product_id, None)
+        self.drop_products([product_id])
+        return True
+
+    def delete_products(self, product_ids: List[str]) -> bool:
+        # Soft-deletes many products in one statement per DELETE_BATCH_SIZE ids, all in one transaction
+        if not product_ids:
+            return True
+        if not self.connection:
+            logger.error("No active database connection")
+            self.error_occurred.emit("No active database connection")
+            return False
+
+        try:
+            with self.connection.cursor() as cursor:
+                for start in range(0, len(product_ids), DELETE_BATCH_SIZE):
+                    batch = product_ids[start:start + DELETE_BATCH_SIZE]
+                    placeholders = ", ".join("?" * len(batch))
+                    cursor.execute(f"""
+                    UPDATE inventory.Product
+                    SET IsDeleted = 1, DeletedDate = GETDATE()
+                    WHERE ProductId IN ({placeholders})
+                    """, batch)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            logger.exception(f"Error deleting products: {e}")
+            self.error_occurred.emit(f"Error deleting products: {str(e)}")
+            return False
+
+        self.reference_cache.clear()
+        for product_id in product_ids:
+            self.details_cache.pop(product_id, None)
+        self.drop_products(product_ids)
+        logger.info(f"Deleted {len(product_ids)} products")
         return True
 
     def search_products(self, search_term: str):
-        query = """
-        SELECT 
-            p.ProductId, p.ProductCode, p.ProductName, p.Description, p.Density, p.State,
-            p.CurrentReserve, u.UnitName, s.StorageTankName
-        FROM inventory.ActiveProduct p
-        LEFT JOIN inventory.ActiveUnit u ON p.UnitId = u.UnitId
-        LEFT JOIN inventory.ActiveStorageTank s ON p.ProductId = s.ProductId
-        WHERE p.ProductCode LIKE ? OR p.ProductName LIKE ?
-        ORDER BY p.ProductName
-        """
+        self.list_pool.start(ProductTask(self.load_search_results, search_term))
+
+    def load_search_results(self, search_term: str):
+        query = PRODUCT_SELECT + f"WHERE {PRODUCT_SEARCH_FILTER}\n" + PRODUCT_ORDER
         search_param = f"%{search_term}%"
-        results = self.execute_query(query, params=(search_param, search_param))
+        results = self.execute_query(query, params=(search_param, search_param), fetch_raw=True)
         if results is not None:
             self.products = results
+            self.search_term = search_term
             self.data_updated.emit()
         else:
             logger.error("Failed to search products")
             self.error_occurred.emit("Failed to search products")
 
-    def get_units(self) -> List[Dict[str, Any]]:
-        query = "SELECT UnitId, UnitName FROM inventory.ActiveUnit"
-        return self.execute_query(query) or []
+    def fetch_reference(self, query: str) -> List[Any]:
+        cached = self.reference_cache.get(query)
+        if cached is not None and time.monotonic() - cached[0] < REFERENCE_TTL:
+            return cached[1]
+        results = self.execute_query(query, fetch_raw=True)
+        if results is None:
+            return []
+        self.reference_cache[query] = (time.monotonic(), results)
+        return results
 
-    def get_storage_tanks(self) -> List[Dict[str, Any]]:
-        query = "SELECT StorageTankId, StorageTankName, ProductId FROM inventory.ActiveStorageTank"
-        return self.execute_query(query) or []
+    def get_units(self) -> List[Any]:
+        return self.fetch_reference(UNITS_QUERY)
+
+    def get_storage_tanks(self, product_id: Optional[str] = None) -> List[Any]:
+        storage_tanks = self.fetch_reference(STORAGE_TANKS_QUERY)
+        if product_id is None:
+            return storage_tanks
+        # Filtered from the cached list: only free tanks and the ones this product already holds
+        return [tank for tank in storage_tanks if tank.ProductId in (None, product_id)]
 
 product_module = ProductModule()
\ No newline at end of file
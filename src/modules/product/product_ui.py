@@ -1,21 +1,93 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                               QTableWidgetItem, QDialog, QFormLayout, QLineEdit, QDoubleSpinBox,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView,
+                               QDialog, QFormLayout, QLineEdit, QDoubleSpinBox,
                                QHeaderView, QAbstractItemView, QComboBox)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, QAbstractTableModel, QModelIndex
 from .product import product_module
 from ui.ui_styles import apply_styles, Styles, TMSWidget, StyledPushButton
 from .server import server_module
+from operator import attrgetter
 import logging
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+class ProductTableModel(QAbstractTableModel):
+    HEADERS = [
+        "Product Code", "Product Name", "Description", "Density", "State",
+        "Current Reserve", "Unit", "Storage Tank Name"
+    ]
+    KEYS = (
+        'ProductCode', 'ProductName', 'Description', 'Density', 'State',
+        'CurrentReserve', 'UnitName', 'StorageTankName'
+    )
+    row_fields = attrgetter(*KEYS)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._products = []
+        self._formatted = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._products)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._formatted[index.row()][index.column()]
+
+    def format_row(self, product):
+        # Cell text is built once per row change, so repaints are plain tuple lookups
+        return tuple(map(str, self.row_fields(product)))
+
+    def product_at(self, row):
+        return self._products[row]
+
+    def set_rows(self, products):
+        old_products = self._products
+        if len(old_products) != len(products) or any(
+                old.ProductId != new.ProductId for old, new in zip(old_products, products)):
+            # Products were added, removed or reordered
+            self.beginResetModel()
+            self._products = products
+            self._formatted = [self.format_row(product) for product in products]
+            self.endResetModel()
+            return
+
+        self._products = products
+        last_column = len(self.HEADERS) - 1
+        for row, (old, new) in enumerate(zip(old_products, products)):
+            if old != new:
+                self._formatted[row] = self.format_row(new)
+                self.dataChanged.emit(self.index(row, 0), self.index(row, last_column))
+
 class ProductWidget(TMSWidget):
     def __init__(self):
         super().__init__()
         self.is_connected = False
         self.init_ui()
-        product_module.data_updated.connect(self.refresh_table)
+
+        # Typing searches once the user pauses instead of once per keystroke
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(self.search_products)
+        self.search_input.textChanged.connect(self._search_timer.start)
+
+        # Every data_updated emitted within one event loop pass collapses into one refresh
+        self._coalesce_timer = QTimer(self)
+        self._coalesce_timer.setSingleShot(True)
+        self._coalesce_timer.setInterval(0)
+        self._coalesce_timer.timeout.connect(self.refresh_table)
+
+        product_module.data_updated.connect(self._coalesce_timer.start)
         product_module.error_occurred.connect(self.show_error_message)
         server_module.connection_status_changed.connect(self.set_connection_status)
 
@@ -51,11 +123,17 @@ class ProductWidget(TMSWidget):
         layout.addLayout(button_layout)
 
         # Table
-        self.table = QTableWidget()
+        self.table = QTableView()
+        self.model = ProductTableModel(self)
+        self.table.setModel(self.model)
         self.table.setStyleSheet(Styles.table_widget())
         self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        # Several rows can be selected for deletion; editing acts on the current row
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setStyleSheet(Styles.header_view())
+        self.table.verticalHeader().setStyleSheet(Styles.header_view())
         layout.addWidget(self.table)
 
         # Connect signals
@@ -73,7 +151,7 @@ class ProductWidget(TMSWidget):
         if is_connected:
             self.refresh_table()
         else:
-            self.table.setRowCount(0)
+            self.model.set_rows([])
         
     def update_server_info(self, server):
         # Update any server-specific information if needed
@@ -89,33 +167,24 @@ class ProductWidget(TMSWidget):
         if not self.is_connected:
             return
 
-        self.table.clear()
         if isinstance(product_module.products, list):
-            self.table.setRowCount(len(product_module.products))
-            self.table.setColumnCount(8)
-            self.table.setHorizontalHeaderLabels([
-                "Product Code", "Product Name", "Description", "Density", "State",
-                "Current Reserve", "Unit", "Storage Tank Name"
-            ])
-
-            for row, product in enumerate(product_module.products):
-                self.table.setItem(row, 0, QTableWidgetItem(str(product.get('ProductCode', ''))))
-                self.table.setItem(row, 1, QTableWidgetItem(str(product.get('ProductName', ''))))
-                self.table.setItem(row, 2, QTableWidgetItem(str(product.get('Description', ''))))
-                self.table.setItem(row, 3, QTableWidgetItem(str(product.get('Density', ''))))
-                self.table.setItem(row, 4, QTableWidgetItem(str(product.get('State', ''))))
-                self.table.setItem(row, 5, QTableWidgetItem(str(product.get('CurrentReserve', ''))))
-                self.table.setItem(row, 6, QTableWidgetItem(str(product.get('UnitName', ''))))
-                self.table.setItem(row, 7, QTableWidgetItem(str(product.get('StorageTankName', ''))))
-
-            self.table.resizeColumnsToContents()
-            self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-            self.table.horizontalHeader().setStyleSheet(Styles.header_view())
-            self.table.verticalHeader().setStyleSheet(Styles.header_view())
+            self.model.set_rows(product_module.products)
         else:
             logger.error(f"Unexpected type for product_module.products: {type(product_module.products)}")
 
+    def selected_product(self):
+        # Read from the model, which holds exactly the rows on screen
+        index = self.table.currentIndex()
+        if not index.isValid():
+            return None
+        return self.model.product_at(index.row())
+
+    def selected_products(self):
+        return [self.model.product_at(index.row()) for index in self.table.selectionModel().selectedRows()]
+
     def search_products(self):
+        # A click on Search supersedes any pending debounced search
+        self._search_timer.stop()
         if not self.is_connected:
             return
         search_term = self.search_input.text()
@@ -129,22 +198,19 @@ class ProductWidget(TMSWidget):
             data = dialog.get_data()
             if product_module.add_product(data):
                 logger.info("Product added successfully.")
-                product_module.fetch_products()
             else:
                 logger.error("Failed to add product.")
 
     def edit_product(self):
         if not self.is_connected:
             return
-        selected_row = self.table.currentRow()
-        if isinstance(product_module.products, list) and 0 <= selected_row < len(product_module.products):
-            product = product_module.products[selected_row]
-            dialog = ProductDialog(self, product.get('ProductId'))
+        product = self.selected_product()
+        if product is not None:
+            dialog = ProductDialog(self, product.ProductId)
             if dialog.exec() == QDialog.DialogCode.Accepted:
                 data = dialog.get_data()
                 if product_module.update_product(data):
                     logger.info("Product updated successfully.")
-                    product_module.fetch_products()
                 else:
                     logger.error("Failed to update product.")
         else:
@@ -153,20 +219,27 @@ class ProductWidget(TMSWidget):
     def delete_product(self):
         if not self.is_connected:
             return
-        selected_row = self.table.currentRow()
-        if isinstance(product_module.products, list) and 0 <= selected_row < len(product_module.products):
-            product = product_module.products[selected_row]
-            product_id = product.get('ProductId')
-            if product_id:
-                if product_module.delete_product(product_id):
-                    logger.info(f"Product {product.get('ProductName', '')} deleted successfully.")
-                    product_module.fetch_products()
-                else:
-                    logger.error(f"Failed to delete product {product.get('ProductName', '')}.")
+        products = self.selected_products()
+        if not products:
+            # The current index can sit on a deselected row, so only the selection counts
+            logger.warning("No product selected for deletion.")
+            return
+        if len(products) > 1:
+            product_ids = [product.ProductId for product in products if product.ProductId]
+            if product_module.delete_products(product_ids):
+                logger.info(f"{len(product_ids)} products deleted successfully.")
             else:
-                logger.error("Invalid product ID for deletion.")
+                logger.error("Failed to delete the selected products.")
+            return
+
+        product = products[0]
+        if product.ProductId:
+            if product_module.delete_product(product.ProductId):
+                logger.info(f"Product {product.ProductName} deleted successfully.")
+            else:
+                logger.error(f"Failed to delete product {product.ProductName}.")
         else:
-            logger.warning("No product selected for deletion.")
+            logger.error("Invalid product ID for deletion.")
 
 
 class ProductDialog(QDialog):
@@ -230,20 +303,21 @@ class ProductDialog(QDialog):
         self.unit_combo.clear()
         if units:
             for unit in units:
-                self.unit_combo.addItem(unit.get('UnitName', ''), unit.get('UnitId'))
+                self.unit_combo.addItem(unit.UnitName, unit.UnitId)
         else:
             self.unit_combo.addItem("No units available", None)
 
     def populate_storage_tanks(self):
-        storage_tanks = product_module.get_storage_tanks()
+        storage_tanks = product_module.get_storage_tanks(self.product_id)
         self.storage_tank_combo.clear()
         self.storage_tank_combo.addItem("No Storage Tank", None)
         if storage_tanks:
             for tank in storage_tanks:
-                status = "Assigned" if tank.get('ProductId') else "Unassigned"
-                self.storage_tank_combo.addItem(f"{tank.get('StorageTankName', '')} ({status})", tank.get('StorageTankId'))
+                status = "Assigned" if tank.ProductId else "Unassigned"
+                self.storage_tank_combo.addItem(f"{tank.StorageTankName} ({status})", tank.StorageTankId)
 
     def populate_data(self):
+        # Served from the module's recent-details cache, which every product write invalidates
         details = product_module.get_product_details(self.product_id)
         if details and isinstance(details, dict):
             self.code_input.setText(str(details.get('ProductCode', '')))
@@ -2,15 +2,15 @@ import pyodbc
 from typing import List, Dict, Optional, Any
 from contextlib import contextmanager
 from datetime import datetime
-from collections import deque
+from collections import deque, defaultdict
 import threading
 import time
-import re
 import os
 import json
+import atexit
 from dataclasses import dataclass, asdict
 import logging
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Signal, QTimer
 from logging.handlers import RotatingFileHandler
 
 # Constants
@@ -18,6 +18,11 @@ CONFIG_FILE = 'config.json'
 LOG_FILE = 'server_module.log'
 MAX_LOG_SIZE = 10 * 1024 * 1024  # 10 MB
 BACKUP_COUNT = 5
+CONFIG_SAVE_DELAY_MS = 2000  # Config edits within this window are written once
+ACTIVITY_LOG_SIZE = 2000
+MODULE_POOL_SIZE = 4  # Idle connections kept per server and module
+MODULE_POOL_IDLE_SECONDS = 300  # Idle connections older than this are closed instead of reused
+MODULE_POOL_SWEEP_MS = 60000
 
 # Configure logging
 logging.basicConfig(
@@ -48,7 +53,7 @@ class ServerInfo:
 
 class DatabaseConnector:
     @staticmethod
-    def connect(server_info: ServerInfo) -> pyodbc.Connection:
+    def connect(server_info: ServerInfo, read_only: bool = False) -> pyodbc.Connection:
         try:
             conn_str = (
                 f"DRIVER={{ODBC Driver 17 for SQL Server}};"
@@ -58,7 +63,10 @@ class DatabaseConnector:
                 f"PWD={server_info.password};"
                 "Encrypt=yes;TrustServerCertificate=yes;Connection Timeout=30;"
             )
-            return pyodbc.connect(conn_str)
+            if read_only:
+                # Lets an Availability Group route read-only sessions to a readable secondary
+                conn_str += "ApplicationIntent=ReadOnly;MultiSubnetFailover=Yes;"
+            return pyodbc.connect(conn_str, autocommit=read_only)
         except pyodbc.Error as e:
             logger.error(f"Failed to connect to {server_info.name}: {str(e)}")
             raise
@@ -73,14 +81,35 @@ class DatabaseConnector:
 class ServerModule(QObject):
     connection_status_changed = Signal(bool, str)
     error_occurred = Signal(str)
+    new_activity = Signal(dict)
 
     def __init__(self):
         super().__init__()
         self.config = self.load_config()
         self.servers = self.config.get('servers', [])
-        self.activity_log = deque(maxlen=2000)
+        # Same dicts as self.servers, looked up by id
+        self.servers_by_id = {server['id']: server for server in self.servers}
+        self.next_server_id = max(self.servers_by_id, default=0) + 1
+        self.activity_log = deque(maxlen=ACTIVITY_LOG_SIZE)
         self.active_server: Optional[ServerInfo] = None
         self.connection = None
+        # (server key, module name) -> deque of (released_at, connection)
+        self.module_pool = defaultdict(deque)
+        # Kept after a disconnect, since modules release their connections once active_server is cleared
+        self.pool_server: Optional[ServerInfo] = None
+        self.pool_lock = threading.Lock()
+        # Closes idle pooled connections past MODULE_POOL_IDLE_SECONDS while nothing is reconnecting
+        self.pool_sweep_timer = QTimer(self)
+        self.pool_sweep_timer.setInterval(MODULE_POOL_SWEEP_MS)
+        self.pool_sweep_timer.timeout.connect(self.sweep_pooled_connections)
+        self.config_dirty = False
+        self.save_timer = QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(CONFIG_SAVE_DELAY_MS)
+        self.save_timer.timeout.connect(self.flush_config)
+        # Anything still pending when the process exits is written then
+        atexit.register(self.flush_config)
+        atexit.register(self.close_pooled_connections)
 
     def load_config(self):
         try:
@@ -94,18 +123,34 @@ class ServerModule(QObject):
 
     def save_config(self):
         try:
-            with open(CONFIG_FILE, 'w') as f:
+            # Write a temp file and swap it in, so a crash mid-write never leaves a truncated config
+            temp_file = f"{CONFIG_FILE}.tmp"
+            with open(temp_file, 'w') as f:
                 json.dump(self.config, f, indent=4)
+            os.replace(temp_file, CONFIG_FILE)
+            self.config_dirty = False
         except Exception as e:
             logger.error(f"Error saving config: {str(e)}")
 
+    def mark_config_dirty(self):
+        # Edits are written together once the save delay passes without another one
+        self.config_dirty = True
+        self.save_timer.start()
+
+    def flush_config(self):
+        if self.config_dirty:
+            self.save_config()
+
     def add_server(self, server_info: ServerInfo) -> bool:
         try:
             self._validate_server_info(server_info)
-            server_info.id = max([s['id'] for s in self.servers] + [0]) + 1
-            self.servers.append(server_info.to_dict())
+            server_info.id = self.next_server_id
+            self.next_server_id += 1
+            server = server_info.to_dict()
+            self.servers.append(server)
+            self.servers_by_id[server_info.id] = server
             self.config['servers'] = self.servers
-            self.save_config()
+            self.mark_config_dirty()
             logger.info(f"Added new server: {server_info.name}")
             self.log_activity("ServerModule", "Add Server", "Success")
             return True
@@ -118,33 +163,35 @@ class ServerModule(QObject):
         return [ServerInfo(**server) for server in self.servers]
 
     def get_server(self, server_id: int) -> Optional[ServerInfo]:
-        for server in self.servers:
-            if server['id'] == server_id:
-                return ServerInfo(**server)
-        return None
+        server = self.servers_by_id.get(server_id)
+        return ServerInfo(**server) if server else None
 
     def update_server(self, server_info: ServerInfo) -> bool:
         try:
             self._validate_server_info(server_info)
-            for i, server in enumerate(self.servers):
-                if server['id'] == server_info.id:
-                    self.servers[i] = server_info.to_dict()
-                    self.config['servers'] = self.servers
-                    self.save_config()
-                    logger.info(f"Updated server: {server_info.name}")
-                    self.log_activity("ServerModule", "Update Server", "Success")
-                    return True
-            logger.error(f"Failed to update server: Server with ID {server_info.id} not found")
-            return False
+            server = self.servers_by_id.get(server_info.id)
+            if server is None:
+                logger.error(f"Failed to update server: Server with ID {server_info.id} not found")
+                return False
+            # Updated in place, so self.servers sees the change too
+            server.clear()
+            server.update(server_info.to_dict())
+            self.config['servers'] = self.servers
+            self.mark_config_dirty()
+            logger.info(f"Updated server: {server_info.name}")
+            self.log_activity("ServerModule", "Update Server", "Success")
+            return True
         except Exception as e:
             logger.exception(f"Error updating server: {e}")
             return False
 
     def delete_server(self, server_id: int) -> bool:
         try:
-            self.servers = [s for s in self.servers if s['id'] != server_id]
+            server = self.servers_by_id.pop(server_id, None)
+            if server is not None:
+                self.servers.remove(server)
             self.config['servers'] = self.servers
-            self.save_config()
+            self.mark_config_dirty()
             logger.info(f"Deleted server with ID: {server_id}")
             self.log_activity("ServerModule", f"Server ID Deleted: {server_id}", "Success")
             return True
@@ -156,6 +203,9 @@ class ServerModule(QObject):
         try:
             self.connection = DatabaseConnector.connect(server_info)
             self.active_server = server_info
+            self.pool_server = server_info
+            # Idle module connections to any other server will not be reused
+            self.close_pooled_connections(keep_server=server_info)
             server_info.last_connection = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             self.update_server(server_info)
             logger.info(f"Connected to database: {server_info.name}")
@@ -183,12 +233,15 @@ class ServerModule(QObject):
                 logger.exception(f"Error disconnecting from database: {e}")
                 self.log_activity("ServerModule", "Disconnect", f"Error: {str(e)}")
                 self.connection_status_changed.emit(False, f"Error disconnecting: {str(e)}")
+            # Modules released their connections into the pool while handling the signal
+            self.pool_sweep_timer.start()
         else:
             logger.warning("No active server to disconnect from")
             self.connection_status_changed.emit(False, "No active connection to disconnect")
 
     def _validate_server_info(self, server_info: ServerInfo) -> None:
-        if not re.match(r'^\d{1,3}(\.\d{1,3}){3}$', server_info.ip_addr):
+        octets = server_info.ip_addr.split('.')
+        if len(octets) != 4 or not all(octet.isdecimal() and len(octet) <= 3 and int(octet) < 256 for octet in octets):
             raise ValueError(f"Invalid IP address: {server_info.ip_addr}")
         if not 1 <= server_info.port <= 65535:
             raise ValueError(f"Invalid port number: {server_info.port}")
@@ -227,6 +280,7 @@ class ServerModule(QObject):
         }
         self.activity_log.appendleft(activity)
         db_activity_logger.info(f"{module} | {activity['server']} | {action} | {status}")
+        self.new_activity.emit(activity)
 
     def get_recent_activities(self) -> List[Dict]:
         return list(self.activity_log)
@@ -241,6 +295,10 @@ class ServerModule(QObject):
         try:
             if self.active_server is None:
                 raise ValueError("Active server is None")
+            connection = self.acquire_pooled_connection((self.server_key(self.active_server), module_name))
+            if connection is not None:
+                logger.info(f"Reused pooled connection for module: {module_name}")
+                return connection
             connection = DatabaseConnector.connect(self.active_server)
             logger.info(f"Created connection for module: {module_name}")
             return connection
@@ -249,6 +307,78 @@ class ServerModule(QObject):
             self.error_occurred.emit(f"Error creating connection for {module_name}: {str(e)}")
             return None
 
+    def release_module_connection(self, module_name: str, connection: pyodbc.Connection) -> None:
+        # Modules hand their connection back here instead of closing it, so the next
+        # connect to the same server skips the login handshake
+        if connection is None:
+            return
+        if self.pool_server is None:
+            DatabaseConnector.disconnect(connection)
+            return
+        try:
+            if not connection.autocommit:
+                connection.rollback()
+        except pyodbc.Error as e:
+            logger.warning(f"Discarding connection released by {module_name}: {e}")
+            DatabaseConnector.disconnect(connection)
+            return
+        with self.pool_lock:
+            pool = self.module_pool[(self.server_key(self.pool_server), module_name)]
+            if len(pool) < MODULE_POOL_SIZE:
+                pool.append((time.monotonic(), connection))
+                return
+        DatabaseConnector.disconnect(connection)
+
+    def acquire_pooled_connection(self, key) -> Optional[pyodbc.Connection]:
+        while True:
+            with self.pool_lock:
+                pool = self.module_pool.get(key)
+                if not pool:
+                    return None
+                released_at, connection = pool.pop()
+            if time.monotonic() - released_at > MODULE_POOL_IDLE_SECONDS:
+                DatabaseConnector.disconnect(connection)
+                continue
+            try:
+                # Match a fresh DatabaseConnector.connect and make sure the session is still alive
+                connection.autocommit = False
+                connection.cursor().execute("SELECT 1").fetchall()
+                return connection
+            except pyodbc.Error as e:
+                logger.warning(f"Dropping stale pooled connection: {e}")
+                DatabaseConnector.disconnect(connection)
+
+    def close_pooled_connections(self, keep_server: Optional[ServerInfo] = None) -> None:
+        keep_key = self.server_key(keep_server) if keep_server else None
+        with self.pool_lock:
+            stale = [key for key in self.module_pool if key[0] != keep_key]
+            connections = [connection for key in stale for _, connection in self.module_pool.pop(key)]
+        for connection in connections:
+            DatabaseConnector.disconnect(connection)
+
+    def sweep_pooled_connections(self) -> None:
+        cutoff = time.monotonic() - MODULE_POOL_IDLE_SECONDS
+        expired = []
+        with self.pool_lock:
+            for key in list(self.module_pool):
+                pool = self.module_pool[key]
+                # Released in time order, so the oldest entries are on the left
+                while pool and pool[0][0] < cutoff:
+                    expired.append(pool.popleft()[1])
+                if not pool:
+                    del self.module_pool[key]
+            pool_empty = not self.module_pool
+        for connection in expired:
+            DatabaseConnector.disconnect(connection)
+        if expired:
+            logger.info(f"Closed {len(expired)} idle pooled connections")
+        if pool_empty:
+            self.pool_sweep_timer.stop()
+
+    @staticmethod
+    def server_key(server_info: ServerInfo) -> tuple:
+        return (server_info.ip_addr, server_info.port, server_info.database, server_info.user)
+
     def get_active_server(self) -> Optional[ServerInfo]:
         return self.active_server
 
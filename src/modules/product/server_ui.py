@@ -1,23 +1,98 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget, QHeaderView,
-                               QTableWidgetItem, QLineEdit, QLabel, QMessageBox, QDialog,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView, QHeaderView,
+                               QAbstractItemView, QLineEdit, QLabel, QMessageBox, QDialog,
                                QFormLayout, QSpinBox, QComboBox, QTextEdit, QSplitter, QCheckBox)
-from PySide6.QtCore import Qt, Signal, QTimer, QObject, QThread
+from PySide6.QtCore import Qt, Signal, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PySide6.QtGui import QIcon
-from .server import server_module, ServerInfo
+from .server import server_module, ServerInfo, ACTIVITY_LOG_SIZE
 from ui.ui_styles import TMSWidget, StyledPushButton, Styles, Colors, Fonts, apply_styles
+from operator import itemgetter
 import logging
 
 logger = logging.getLogger('server_ui')
 
-class DatabaseActivityWorker(QObject):
-    activity_updated = Signal(list)
+class ServerTableModel(QAbstractTableModel):
+    HEADERS = ["ID", "Name", "IP Address", "Type", "Active", "Connected", "Last Connection"]
 
-    def update_activity(self):
-        try:
-            activities = server_module.get_recent_activities()
-            self.activity_updated.emit(activities)
-        except Exception as e:
-            logger.exception(f"Error updating database activity: {e}")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._servers = []
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def format_row(self, server, connected_id):
+        return (
+            str(server.id), server.name, server.ip_addr, server.server_type,
+            "Yes" if server.is_active else "No",
+            "Yes" if server.id == connected_id else "No",
+            str(server.last_connection)
+        )
+
+    def set_rows(self, servers, connected_id):
+        self.beginResetModel()
+        self._servers = list(servers)
+        self._rows = [self.format_row(server, connected_id) for server in self._servers]
+        self.endResetModel()
+
+    def server_at(self, row):
+        return self._servers[row]
+
+class ActivityTableModel(QAbstractTableModel):
+    HEADERS = ["Timestamp", "Module", "Server", "Action", "Status"]
+    row_fields = itemgetter('timestamp', 'module', 'server', 'action', 'status')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        return self._rows[index.row()][index.column()]
+
+    def format_row(self, activity):
+        return tuple(map(str, self.row_fields(activity)))
+
+    def set_rows(self, activities):
+        self.beginResetModel()
+        self._rows = [self.format_row(activity) for activity in activities]
+        self.endResetModel()
+
+    def add_activity(self, activity):
+        # Newest first, capped like server_module.activity_log
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self._rows.insert(0, self.format_row(activity))
+        self.endInsertRows()
+        if len(self._rows) > ACTIVITY_LOG_SIZE:
+            last = len(self._rows) - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self._rows.pop()
+            self.endRemoveRows()
 
 class ServerWidget(TMSWidget):
     server_added = Signal(ServerInfo)
@@ -60,7 +135,11 @@ class ServerWidget(TMSWidget):
         left_layout.addLayout(search_layout)
 
         # Server table
-        self.server_table = QTableWidget()
+        self.server_model = ServerTableModel(self)
+        self.server_proxy = QSortFilterProxyModel(self)
+        self.server_proxy.setSourceModel(self.server_model)
+        self.server_table = QTableView()
+        self.server_table.setModel(self.server_proxy)
         self.create_server_table()
         left_layout.addWidget(self.server_table)
 
@@ -92,7 +171,11 @@ class ServerWidget(TMSWidget):
         activity_label.setFont(Fonts.SUBTITLE)
         right_layout.addWidget(activity_label)
 
-        self.activity_table = QTableWidget()
+        self.activity_model = ActivityTableModel(self)
+        self.activity_proxy = QSortFilterProxyModel(self)
+        self.activity_proxy.setSourceModel(self.activity_model)
+        self.activity_table = QTableView()
+        self.activity_table.setModel(self.activity_proxy)
         self.create_activity_table()
         right_layout.addWidget(self.activity_table)
 
@@ -102,58 +185,54 @@ class ServerWidget(TMSWidget):
         content.setStretchFactor(1, 1)
 
     def create_server_table(self):
-        headers = ["ID", "Name", "IP Address", "Type", "Active", "Connected", "Last Connection"]
-        self.server_table.setColumnCount(len(headers))
-        self.server_table.setHorizontalHeaderLabels(headers)
-    
         # Set horizontal header properties
         horizontal_header = self.server_table.horizontalHeader()
         horizontal_header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         horizontal_header.setStretchLastSection(True)
         # Enable interactive resizing for all columns
-        for i in range(len(headers)):
+        for i in range(len(ServerTableModel.HEADERS)):
             horizontal_header.setSectionResizeMode(i, QHeaderView.ResizeMode.Interactive)
         
         # Set vertical header properties
         vertical_header = self.server_table.verticalHeader()
         vertical_header.setVisible(False)
-        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        # Fixed row height so repopulating does not measure every row
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.server_table.fontMetrics().height() + 10)
     
         # Set table properties
-        self.server_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.server_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.server_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.server_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.server_table.setAlternatingRowColors(True)
         self.server_table.setSortingEnabled(True)
         self.server_table.setWordWrap(True)
     
         # Connect signals
-        self.server_table.cellClicked.connect(self.server_selected)
-        self.server_table.cellDoubleClicked.connect(self.modify_server)
+        self.server_table.clicked.connect(self.server_selected)
+        self.server_table.doubleClicked.connect(self.modify_server)
     
         # Apply style
         
         
         # Adjust table to contents
         self.server_table.resizeColumnsToContents()
-        self.server_table.resizeRowsToContents()
         self.server_table.setColumnWidth(0, 50)  # Set a fixed width for the ID column
         horizontal_header.setMinimumSectionSize(100)  # Set a minimum width for all columns
 
 
     def create_activity_table(self):
-        headers = ["Timestamp", "Module", "Server", "Action", "Status"]
-        self.activity_table.setColumnCount(len(headers))
-        self.activity_table.setHorizontalHeaderLabels(headers)
-        
         self.activity_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.activity_table.verticalHeader().setVisible(False)
-        self.activity_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.activity_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
+        self.activity_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.activity_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.activity_table.setAlternatingRowColors(True)
         self.activity_table.setSortingEnabled(True)
-        
-        self.activity_table.setWordWrap(True)
-        self.activity_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        self.activity_table.sortByColumn(0, Qt.SortOrder.DescendingOrder)
+
+        # Up to 2000 single-line rows; measuring each one would dominate a refresh
+        vertical_header = self.activity_table.verticalHeader()
+        vertical_header.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        vertical_header.setDefaultSectionSize(self.activity_table.fontMetrics().height() + 10)
 
 
     def load_all_servers(self):
@@ -165,23 +244,21 @@ class ServerWidget(TMSWidget):
             QMessageBox.critical(self, "Load Error", f"Failed to load servers: {str(e)}")
 
     def populate_server_table(self, servers):
-        self.server_table.setSortingEnabled(False)
-        self.server_table.setRowCount(len(servers))
-        for row, server in enumerate(servers):
-            self.server_table.setItem(row, 0, QTableWidgetItem(str(server.id)))
-            self.server_table.setItem(row, 1, QTableWidgetItem(server.name))
-            self.server_table.setItem(row, 2, QTableWidgetItem(server.ip_addr))
-            self.server_table.setItem(row, 3, QTableWidgetItem(server.server_type))
-            self.server_table.setItem(row, 4, QTableWidgetItem("Yes" if server.is_active else "No"))
-            self.server_table.setItem(row, 5, QTableWidgetItem("Yes" if server_module.is_connected() and server_module.get_active_server() == server else "No"))
-            self.server_table.setItem(row, 6, QTableWidgetItem(str(server.last_connection)))
-            self.server_table.setItem(row, 7, QTableWidgetItem(server.remarks))
-        
-        self.server_table.resizeRowsToContents()
+        # The connection state is the same for every row of one refresh
+        active_server = server_module.get_active_server()
+        connected_id = active_server.id if active_server and server_module.is_connected() else None
+
+        self.server_model.set_rows(servers, connected_id)
         self.update_button_states()
-        self.server_table.setSortingEnabled(True)
 
-    def server_selected(self, row, column):
+    def selected_server_id(self):
+        selected_rows = self.server_table.selectionModel().selectedRows()
+        if len(selected_rows) != 1:
+            return None
+        source_row = self.server_proxy.mapToSource(selected_rows[0]).row()
+        return self.server_model.server_at(source_row).id
+
+    def server_selected(self, index):
         self.update_button_states()
 
     def update_button_states(self):
@@ -207,9 +284,8 @@ class ServerWidget(TMSWidget):
 
     def modify_server(self):
         try:
-            selected_rows = self.server_table.selectionModel().selectedRows()
-            if len(selected_rows) == 1:
-                server_id = int(self.server_table.item(selected_rows[0].row(), 0).text())
+            server_id = self.selected_server_id()
+            if server_id is not None:
                 server = server_module.get_server(server_id)
                 if server:
                     dialog = ServerConnectionDialog(self, server)
@@ -231,9 +307,8 @@ class ServerWidget(TMSWidget):
 
     def delete_server(self):
         try:
-            selected_rows = self.server_table.selectionModel().selectedRows()
-            if len(selected_rows) == 1:
-                server_id = int(self.server_table.item(selected_rows[0].row(), 0).text())
+            server_id = self.selected_server_id()
+            if server_id is not None:
                 confirm = QMessageBox.question(self, "Confirm Deletion", "Are you sure you want to delete this server?",
                                                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
                 if confirm == QMessageBox.StandardButton.Yes:
@@ -251,9 +326,8 @@ class ServerWidget(TMSWidget):
 
     def connect_to_server(self):
         try:
-            selected_rows = self.server_table.selectionModel().selectedRows()
-            if len(selected_rows) == 1:
-                server_id = int(self.server_table.item(selected_rows[0].row(), 0).text())
+            server_id = self.selected_server_id()
+            if server_id is not None:
                 server = server_module.get_server(server_id)
                 if server:
                     confirm = QMessageBox.question(self, "Connect to Server", 
@@ -285,41 +359,17 @@ class ServerWidget(TMSWidget):
             QMessageBox.critical(self, "Search Error", f"An unexpected error occurred while searching: {str(e)}")
 
     def start_activity_monitor(self):
-        self.worker = DatabaseActivityWorker()
-        self.worker_thread = QThread()
-        self.worker.moveToThread(self.worker_thread)
-
-        self.worker.activity_updated.connect(self.update_activity_table)
-        self.worker_thread.started.connect(self.worker.update_activity)
-
-        self.timer = QTimer()
-        self.timer.setInterval(5000)  # Update every 5 seconds
-        self.timer.timeout.connect(self.worker.update_activity)
-
-        self.worker_thread.start()
-        self.timer.start()
-
-    def update_activity_table(self, activities):
-        self.activity_table.setSortingEnabled(False)
-        self.activity_table.setRowCount(len(activities))
-        
-        for row, activity in enumerate(activities):
-            for col, key in enumerate(['timestamp', 'module', 'server', 'action', 'status']):
-                item = QTableWidgetItem(str(activity[key]))
-                if col == 0:  # Timestamp column
-                    item.setData(Qt.ItemDataRole.UserRole, activity[key])
-                self.activity_table.setItem(row, col, item)
-        
-        self.activity_table.setSortingEnabled(True)
-        self.activity_table.sortItems(0, Qt.SortOrder.DescendingOrder)
+        # Load what is already logged, then append each activity as it happens
+        self.activity_model.set_rows(server_module.get_recent_activities())
+        server_module.new_activity.connect(self.activity_model.add_activity)
 
     def closeEvent(self, event):
         try:
-            if hasattr(self, 'timer'):
-                self.timer.stop()
-            if hasattr(self, 'worker_thread'):
-                self.worker_thread.quit()
-                self.worker_thread.wait()
+            try:
+                server_module.new_activity.disconnect(self.activity_model.add_activity)
+            except (TypeError, RuntimeError):
+                pass
+            server_module.flush_config()
             super().closeEvent(event)
         except Exception as e:
             logger.exception(f"Error in closeEvent: {e}")
@@ -51,7 +51,7 @@ class StorageTankModule(QObject):
         self.stop_real_time_updates()
         if self.connection:
             try:
-                self.connection.close()
+                server_module.release_module_connection(self.__class__.__name__, self.connection)
                 logger.info("StorageTankModule disconnected from database")
             except Exception as e:
                 logger.error(f"Error disconnecting from database: {e}")
@@ -62,7 +62,7 @@ class WeighbridgeModule(QObject):
         """
         if self.connection:
             try:
-                self.connection.close()
+                server_module.release_module_connection(self.__class__.__name__, self.connection)
                 logger.info("WeighbridgeModule disconnected from database")
             except Exception as e:
                 logger.error(f"Error disconnecting from database: {e}")
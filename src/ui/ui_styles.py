@@ -1,8 +1,8 @@
 # ui_styles.py
 from PySide6.QtWidgets import (QWidget, QStyle, QStyleOption, QPushButton, QMainWindow, QDialog, QLineEdit, 
-                               QTextEdit, QSpinBox, QProgressBar, QStatusBar, QComboBox, QTableWidget, QFrame, 
+                               QTextEdit, QSpinBox, QProgressBar, QStatusBar, QComboBox, QTableView, QFrame, 
                                QTabWidget, QLabel, QCheckBox, QRadioButton, QGroupBox, QScrollArea, QMenuBar, 
-                               QMenu, QDateTimeEdit, QVBoxLayout, QHBoxLayout, QTableWidgetItem, QHeaderView, 
+                               QMenu, QDateTimeEdit, QVBoxLayout, QHBoxLayout, QHeaderView, 
                                QDateEdit, QMessageBox, QSizePolicy, QFormLayout, QDialogButtonBox, QDoubleSpinBox, 
                                QAbstractItemView, QFileDialog, QTimeEdit, QSplitter)
 from PySide6.QtGui import QColor, QPalette, QFont, QPainter, QIcon
@@ -259,37 +259,37 @@ class Styles:
     @staticmethod
     def table_widget():
         return f"""
-        QTableWidget {{
+        QTableView {{
             background-color: {Colors.CONTENT_BACKGROUND};
             color: {Colors.TEXT};
             gridline-color: {Colors.LIGHT_GRAY};
             border: none;
             border-radius: 4px;
         }}
-        QTableWidget QHeaderView::section {{
+        QTableView QHeaderView::section {{
             background-color: {Colors.TABLE_HEADER};
             color: {Colors.CONTENT_BACKGROUND};
             padding: 8px;
             border: none;
             font-weight: bold;
         }}
-        QTableWidget::item {{
+        QTableView::item {{
             padding: 6px;
         }}
-        QTableWidget::item:selected {{
+        QTableView::item:selected {{
             background-color: {Colors.PRIMARY};
             color: {Colors.CONTENT_BACKGROUND};
         }}
-        QTableWidget::item:hover {{
+        QTableView::item:hover {{
             background-color: {Colors.LIGHT_GRAY};
         }}
-        QTableWidget QHeaderView::section:horizontal {{
+        QTableView QHeaderView::section:horizontal {{
             stretch: 1;
         }}
-        QTableWidget QHeaderView::section:vertical {{
+        QTableView QHeaderView::section:vertical {{
             resize: none;
         }}
-        QTableWidget QHeaderView {{
+        QTableView QHeaderView {{
             background-color: {Colors.TABLE_HEADER};
         }}
         """
@@ -616,7 +616,7 @@ def apply_styles(widget, recursive=True):
         QProgressBar: Styles.progress_bar,
         QStatusBar: Styles.status_bar,
         QComboBox: Styles.combo_box,
-        QTableWidget: Styles.table_widget,
+        QTableView: Styles.table_widget,
         QFrame: Styles.frame,
         QTabWidget: Styles.tab_widget,
         QLabel: Styles.label,
@@ -658,7 +658,7 @@ def apply_styles(widget, recursive=True):
             apply_styles(child, recursive=False)
 
 def apply_table_styles(table_widget):
-    if isinstance(table_widget, QTableWidget):
+    if isinstance(table_widget, QTableView):
         table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         table_widget.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
         table_widget.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)